@@ -5,6 +5,7 @@ Attractions API with PostgreSQL
 from flask import Blueprint, request, jsonify
 from app.models import db, Attraction
 from app.utils.decorators import log_request
+from app.services.autocomplete_service import AutocompleteService
 
 bp = Blueprint('attractions', __name__)
 
@@ -31,6 +32,23 @@ def get_attractions():
         return jsonify({'error': str(e)}), 500
 
 
+@bp.route('/autocomplete', methods=['GET'])
+@log_request
+def autocomplete_attractions():
+    """Suggest attraction names starting with the typed prefix"""
+    try:
+        prefix = request.args.get('q', '').strip()
+        limit = max(1, min(request.args.get('limit', 8, type=int), 50))
+        
+        if not prefix:
+            return jsonify([])
+        
+        return jsonify(AutocompleteService.suggest(Attraction, prefix, limit))
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @bp.route('/<int:attraction_id>', methods=['GET'])
 @log_request
 def get_attraction(attraction_id):
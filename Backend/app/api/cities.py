@@ -6,6 +6,7 @@ from flask import Blueprint, jsonify, request
 from app.models import City, Attraction, db
 from sqlalchemy import or_
 from app.api.auth import token_required
+from app.services.autocomplete_service import AutocompleteService
 
 bp = Blueprint('cities', __name__)
 
@@ -58,6 +59,21 @@ def get_cities():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@bp.route('/autocomplete', methods=['GET'])
+def autocomplete_cities():
+    """Suggest city names starting with the typed prefix"""
+    try:
+        prefix = request.args.get('q', '').strip()
+        limit = max(1, min(request.args.get('limit', 8, type=int), 50))
+        
+        if not prefix:
+            return jsonify({'success': True, 'suggestions': []})
+        
+        suggestions = AutocompleteService.suggest(City, prefix, limit)
+        return jsonify({'success': True, 'suggestions': suggestions})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @bp.route('/<int:city_id>', methods=['GET'])
 def get_city(city_id):
     """Get single city by ID"""
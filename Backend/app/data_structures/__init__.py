@@ -8,6 +8,7 @@ from .stack import Stack
 from .queue import Queue
 from .binary_search_tree import BinarySearchTree, TreeNode
 from .hash_table import HashTable
+from .trie import Trie, TrieNode
 from .graph import Graph
 
 __all__ = [
@@ -18,5 +19,7 @@ __all__ = [
     'BinarySearchTree',
     'TreeNode',
     'HashTable',
+    'Trie',
+    'TrieNode',
     'Graph'
 ]
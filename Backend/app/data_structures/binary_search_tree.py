@@ -28,6 +28,36 @@ class BinarySearchTree:
         self.root = None
         self._size = 0
     
+    @classmethod
+    def from_sorted(cls, items):
+        """
+        Build a height-balanced BST from key-sorted (key, value) pairs - O(n)
+        Inserting sorted keys one by one would produce a linked-list shaped
+        tree, so the middle item becomes the root of each subtree instead.
+        
+        Args:
+            items: Sequence of (key, value) pairs sorted by key, unique keys
+        Returns:
+            New BinarySearchTree
+        """
+        tree = cls()
+        items = list(items)
+        tree.root = tree._build_balanced(items, 0, len(items) - 1)
+        tree._size = len(items)
+        return tree
+    
+    def _build_balanced(self, items, low, high):
+        """Recursive balanced construction - depth is O(log n)"""
+        if low > high:
+            return None
+        
+        mid = (low + high) // 2
+        key, value = items[mid]
+        node = TreeNode(key, value)
+        node.left = self._build_balanced(items, low, mid - 1)
+        node.right = self._build_balanced(items, mid + 1, high)
+        return node
+    
     def insert(self, key, value=None):
         """
         Insert key-value pair into BST
@@ -171,6 +201,40 @@ class BinarySearchTree:
             result.append((node.key, node.value))
             self._inorder_recursive(node.right, result)
     
+    def iter_range(self, min_key=None, max_key=None, reverse=False):
+        """
+        Lazily yield (key, value) pairs with min_key <= key <= max_key
+        Iterative inorder walk that skips subtrees outside the range,
+        so reading the first k items costs O(log n + k)
+        
+        Args:
+            min_key: Lower bound (inclusive), None for unbounded
+            max_key: Upper bound (inclusive), None for unbounded
+            reverse: Yield in descending key order
+        """
+        stack = []
+        node = self.root
+        
+        while stack or node is not None:
+            if node is not None:
+                # Whole near-side subtree is out of range - go to the far side
+                if not reverse and min_key is not None and node.key < min_key:
+                    node = node.right
+                    continue
+                if reverse and max_key is not None and node.key > max_key:
+                    node = node.left
+                    continue
+                stack.append(node)
+                node = node.right if reverse else node.left
+            else:
+                node = stack.pop()
+                if not reverse and max_key is not None and node.key > max_key:
+                    return
+                if reverse and min_key is not None and node.key < min_key:
+                    return
+                yield node.key, node.value
+                node = node.left if reverse else node.right
+    
     def preorder_traversal(self):
         """
         Preorder traversal (Root -> Left -> Right)
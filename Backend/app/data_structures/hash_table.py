@@ -4,10 +4,301 @@ Used for: Fast lookups, caching, indexing
 Average Time Complexity: O(1) for insert, search, delete
 """
 
+import sys
+from contextlib import nullcontext
+from threading import RLock
+from time import monotonic
+
+# Key markers for slots that were never used / whose entry was deleted
+_EMPTY = object()
+_DELETED = object()
+
+# Fibonacci hashing: multiply by 2^64 / golden ratio and keep the top bits
+_GOLDEN = 0x9E3779B97F4A7C15
+_WORD = 0xFFFFFFFFFFFFFFFF
+
 
 class HashTable:
     """
-    Custom Hash Table using separate chaining for collision resolution
+    Custom Hash Table using open addressing with linear probing
+    Entries live in three parallel arrays (hashes, keys, values) instead
+    of a list of buckets, so a lookup is a short scan of adjacent slots.
+    Deleted slots become tombstones that later inserts reuse.
+    The table doubles above load_factor_threshold and halves when deletes
+    leave it below shrink_threshold, never below its initial size.
+    Demonstrates: hashing, open addressing, tombstones, load factor management
+    """
+    
+    MIN_SIZE = 8
+    
+    def __init__(self, initial_size=100):
+        self._count = 0
+        self._deleted = 0
+        self.load_factor_threshold = 0.75
+        self.shrink_threshold = 0.2
+        self._min_size = self._size_for(initial_size, self.MIN_SIZE)
+        self._allocate(self._min_size)
+    
+    def _allocate(self, size):
+        """Fresh, empty slot arrays (size is a power of two)"""
+        self.size = size
+        self._mask = size - 1
+        self._shift = 64 - size.bit_length() + 1
+        self._hashes = [0] * size
+        self._keys = [_EMPTY] * size
+        self._values = [None] * size
+    
+    def _size_for(self, count, minimum):
+        """
+        Smallest power-of-two size (at least minimum) that holds count
+        entries at no more than load_factor_threshold
+        """
+        size = minimum
+        while count > size * self.load_factor_threshold:
+            size *= 2
+        return size
+    
+    def _hash(self, key):
+        """
+        Home slot of a key
+        Uses Python's built-in hash, which is bounded to a machine word and
+        cached on str objects, so hashing a long string is O(1) after the
+        first time. The hash is scrambled with Fibonacci hashing so that
+        runs of consecutive ints don't fill runs of adjacent slots.
+        """
+        return (hash(key) * _GOLDEN & _WORD) >> self._shift
+    
+    def _find(self, key, hash_value):
+        """Slot holding key, or -1"""
+        keys = self._keys
+        hashes = self._hashes
+        mask = self._mask
+        index = (hash_value * _GOLDEN & _WORD) >> self._shift
+        while True:
+            k = keys[index]
+            if k is _EMPTY:
+                return -1
+            if hashes[index] == hash_value and k is not _DELETED and (k is key or k == key):
+                return index
+            index = (index + 1) & mask
+    
+    def put(self, key, value):
+        """
+        Insert or update key-value pair - O(1) average
+        Args:
+            key: Hashable key
+            value: Associated value
+        """
+        hash_value = hash(key)
+        keys = self._keys
+        hashes = self._hashes
+        mask = self._mask
+        index = (hash_value * _GOLDEN & _WORD) >> self._shift
+        tombstone = -1
+        
+        while True:
+            k = keys[index]
+            if k is _EMPTY:
+                break
+            if k is _DELETED:
+                if tombstone < 0:
+                    tombstone = index
+            elif hashes[index] == hash_value and (k is key or k == key):
+                # Update if key exists
+                self._values[index] = value
+                return
+            index = (index + 1) & mask
+        
+        # Add new key-value pair, reusing the first tombstone on the way
+        if tombstone >= 0:
+            index = tombstone
+            self._deleted -= 1
+        hashes[index] = hash_value
+        keys[index] = key
+        self._values[index] = value
+        self._count += 1
+        
+        # Tombstones lengthen probes too, so they count towards the load
+        if self._count + self._deleted > self.size * self.load_factor_threshold:
+            self._resize()
+    
+    def get(self, key, default=None):
+        """
+        Get value by key - O(1) average
+        Args:
+            key: Key to search for
+            default: Default value if key not found
+        Returns:
+            Value associated with key, or default
+        """
+        index = self._find(key, hash(key))
+        return default if index < 0 else self._values[index]
+    
+    def delete(self, key):
+        """
+        Delete key-value pair - O(1) average
+        Returns: True if deleted, False if not found
+        """
+        index = self._find(key, hash(key))
+        if index < 0:
+            return False
+        
+        self._keys[index] = _DELETED
+        self._values[index] = None
+        self._count -= 1
+        self._deleted += 1
+        
+        if self.size > self._min_size and self._count < self.size * self.shrink_threshold:
+            # Shrink to the size that leaves the table at most half full
+            size = max(self._min_size, self._size_for(self._count * 2, self.MIN_SIZE))
+            if size < self.size:
+                self._rehash(size)
+        return True
+    
+    def contains(self, key):
+        """Check if key exists in hash table"""
+        return self._find(key, hash(key)) >= 0
+    
+    def _load_factor(self):
+        """Calculate current load factor (live entries and tombstones)"""
+        return (self._count + self._deleted) / self.size
+    
+    def _resize(self):
+        """
+        Rebuild the slot arrays when load factor exceeds threshold
+        Grows only if live entries need it; otherwise dropping the
+        tombstones is enough.
+        Demonstrates: dynamic resizing, rehashing
+        """
+        self._rehash(self.size * 2 if self._count * 2 > self.size else self.size)
+    
+    def _rehash(self, size):
+        """
+        Move every live entry into fresh arrays of the given size
+        Keys are known to be distinct and their hashes are stored, so each
+        entry goes straight into the first free slot from its home slot
+        without equality checks or load factor checks.
+        """
+        old_hashes = self._hashes
+        old_keys = self._keys
+        old_values = self._values
+        self._allocate(size)
+        self._deleted = 0
+        
+        hashes = self._hashes
+        keys = self._keys
+        values = self._values
+        mask = self._mask
+        shift = self._shift
+        for hash_value, key, value in zip(old_hashes, old_keys, old_values):
+            if key is _EMPTY or key is _DELETED:
+                continue
+            index = (hash_value * _GOLDEN & _WORD) >> shift
+            while keys[index] is not _EMPTY:
+                index = (index + 1) & mask
+            hashes[index] = hash_value
+            keys[index] = key
+            values[index] = value
+    
+    def reserve(self, count):
+        """
+        Presize the table for count entries
+        A bulk load of count entries then runs without any resize.
+        
+        Args:
+            count: Number of entries the table should hold
+        """
+        size = self._size_for(count, self.size)
+        if size > self.size:
+            self._rehash(size)
+    
+    def update(self, items):
+        """
+        Insert or update many key-value pairs
+        Reserves room for all of them first when their number is known.
+        
+        Args:
+            items: Dict or iterable of (key, value) tuples
+        """
+        if isinstance(items, dict):
+            items = items.items()
+        if hasattr(items, '__len__'):
+            self.reserve(self._count + len(items))
+        for key, value in items:
+            self.put(key, value)
+    
+    def _live_slots(self):
+        """Indexes of slots holding an entry"""
+        return [index for index, k in enumerate(self._keys)
+                if k is not _EMPTY and k is not _DELETED]
+    
+    def keys(self):
+        """Return list of all keys"""
+        keys = self._keys
+        return [keys[index] for index in self._live_slots()]
+    
+    def values(self):
+        """Return list of all values"""
+        values = self._values
+        return [values[index] for index in self._live_slots()]
+    
+    def items(self):
+        """Return list of all (key, value) tuples"""
+        keys = self._keys
+        values = self._values
+        return [(keys[index], values[index]) for index in self._live_slots()]
+    
+    def clear(self):
+        """Remove all items (the table goes back to its initial size)"""
+        self._allocate(self._min_size)
+        self._count = 0
+        self._deleted = 0
+    
+    def is_empty(self):
+        """Check if hash table is empty"""
+        return self._count == 0
+    
+    def __len__(self):
+        """Return number of items"""
+        return self._count
+    
+    def __contains__(self, key):
+        """Support 'in' operator"""
+        return self.contains(key)
+    
+    def __getitem__(self, key):
+        """Support bracket notation for getting: table[key]"""
+        index = self._find(key, hash(key))
+        if index < 0:
+            raise KeyError(f"Key '{key}' not found")
+        return self._values[index]
+    
+    def __setitem__(self, key, value):
+        """Support bracket notation for setting: table[key] = value"""
+        self.put(key, value)
+    
+    def __delitem__(self, key):
+        """Support del operator: del table[key]"""
+        if not self.delete(key):
+            raise KeyError(f"Key '{key}' not found")
+    
+    def __iter__(self):
+        """Iterate over keys"""
+        return iter(self.keys())
+    
+    def __repr__(self):
+        items = self.items()
+        return f"HashTable({dict(items)})"
+    
+    def __str__(self):
+        items = {k: v for k, v in self.items()}
+        return f"HashTable({items})"
+
+
+class ChainedHashTable:
+    """
+    Original Hash Table using separate chaining for collision resolution
+    Kept as the baseline for benchmarks/bench_hash_table.py; use HashTable.
     Demonstrates: hashing, collision handling, load factor management
     """
     
@@ -174,58 +465,245 @@ class HashTable:
     
     def __repr__(self):
         items = self.items()
-        return f"HashTable({dict(items)})"
+        return f"ChainedHashTable({dict(items)})"
     
     def __str__(self):
         items = {k: v for k, v in self.items()}
-        return f"HashTable({items})"
+        return f"ChainedHashTable({items})"
+
+
+class _CacheEntry:
+    """Node of the LRUCache recency list"""
+    
+    __slots__ = ('key', 'value', 'size', 'expires', 'prev', 'next')
+    
+    def __init__(self, key=None, value=None, size=0, expires=None):
+        self.key = key
+        self.value = value
+        self.size = size
+        self.expires = expires
+        self.prev = self
+        self.next = self
 
 
 class LRUCache:
     """
     Least Recently Used Cache using HashTable
-    Demonstrates: practical application of hash table
+    The table maps each key to a node of a doubly linked list kept in
+    recency order, so get, put and eviction are all O(1). Entries can
+    expire after a TTL, and the cache can be bounded by entry count and
+    by approximate bytes.
+    Demonstrates: practical application of hash table, intrusive linked list
+    
+    Example:
+        cache = LRUCache(1000, max_bytes=10 * 1024 * 1024, ttl=300)
+        cache.put('/api/cities', cities)
+        cache.get('/api/cities')        # cities, or None once expired
     """
     
-    def __init__(self, capacity=100):
+    def __init__(self, capacity=100, max_bytes=None, ttl=None, thread_safe=False,
+                 sizeof=sys.getsizeof, on_evict=None):
+        """
+        Initialize cache
+        Args:
+            capacity: Maximum number of entries
+            max_bytes: Approximate memory budget (None = no byte limit)
+            ttl: Default seconds before an entry expires (None = never)
+            thread_safe: Guard every operation with a lock
+            sizeof: Function giving the size of a value in bytes
+            on_evict: Called as on_evict(key, value) when an entry is
+                evicted or expires (not on delete() or clear())
+        """
         self.capacity = capacity
-        self.cache = HashTable(capacity)
-        self.access_order = []  # Track access order
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.on_evict = on_evict
+        
+        self.cache = HashTable(capacity)  # {key: _CacheEntry}
+        self._root = _CacheEntry()        # root.next is least, root.prev most recently used
+        self._bytes = 0
+        self._lock = RLock() if thread_safe else nullcontext()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def _unlink(self, entry):
+        entry.prev.next = entry.next
+        entry.next.prev = entry.prev
+    
+    def _append(self, entry):
+        """Link entry as the most recently used"""
+        root = self._root
+        last = root.prev
+        entry.prev = last
+        entry.next = root
+        last.next = entry
+        root.prev = entry
+    
+    def _remove(self, entry):
+        """Drop entry from the table and the list"""
+        self._unlink(entry)
+        self.cache.delete(entry.key)
+        self._bytes -= entry.size
+    
+    def _live(self, key):
+        """Entry for key, or None (an expired entry is removed)"""
+        entry = self.cache.get(key)
+        if entry is not None and entry.expires is not None and entry.expires <= monotonic():
+            self._remove(entry)
+            self.expirations += 1
+            if self.on_evict:
+                self.on_evict(entry.key, entry.value)
+            return None
+        return entry
     
-    def get(self, key):
-        """Get value and mark as recently used"""
-        value = self.cache.get(key)
+    def get(self, key, default=None):
+        """
+        Get value and mark as recently used - O(1)
+        A cached None is returned as a hit.
+        Args:
+            key: Key to look up
+            default: Returned on a miss or if the entry expired
+        """
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            
+            self._unlink(entry)
+            self._append(entry)
+            self.hits += 1
+            return entry.value
+    
+    def peek(self, key, default=None):
+        """Get value without changing recency or statistics"""
+        with self._lock:
+            entry = self._live(key)
+            return default if entry is None else entry.value
+    
+    def put(self, key, value, ttl=None, size=None):
+        """
+        Put value and evict least recently used entries if needed - O(1)
+        Args:
+            key: Hashable key
+            value: Value to cache
+            ttl: Seconds before this entry expires (default: the cache's ttl)
+            size: Size in bytes (default: sizeof(value) if max_bytes is set)
+        Returns:
+            True if cached, False if the value alone exceeds max_bytes
+            (any older value for key is evicted so it is never served)
+        """
+        if size is None:
+            size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            with self._lock:
+                entry = self.cache.get(key)
+                if entry is not None:
+                    self._remove(entry)
+                    self.evictions += 1
+                    if self.on_evict:
+                        self.on_evict(entry.key, entry.value)
+            return False
         
-        if value is not None:
-            # Move to end (most recently used)
-            if key in self.access_order:
-                self.access_order.remove(key)
-            self.access_order.append(key)
+        ttl = self.ttl if ttl is None else ttl
+        expires = monotonic() + ttl if ttl is not None else None
         
-        return value
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                # Update existing entry and mark as recently used
+                self._unlink(entry)
+                self._bytes += size - entry.size
+                entry.value = value
+                entry.size = size
+                entry.expires = expires
+            else:
+                entry = _CacheEntry(key, value, size, expires)
+                self.cache.put(key, entry)
+                self._bytes += size
+            self._append(entry)
+            
+            # Evict least recently used entries until within both limits
+            root = self._root
+            while root.next is not entry and (
+                    len(self.cache) > self.capacity
+                    or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                oldest = root.next
+                self._remove(oldest)
+                self.evictions += 1
+                if self.on_evict:
+                    self.on_evict(oldest.key, oldest.value)
+            return True
     
-    def put(self, key, value):
-        """Put value and evict least recently used if needed"""
-        # If key exists, update and mark as recently used
-        if key in self.cache:
-            self.cache.put(key, value)
-            self.access_order.remove(key)
-            self.access_order.append(key)
-            return
-        
-        # If cache is full, evict least recently used
-        if len(self.cache) >= self.capacity:
-            lru_key = self.access_order.pop(0)
-            self.cache.delete(lru_key)
-        
-        # Add new item
-        self.cache.put(key, value)
-        self.access_order.append(key)
+    def delete(self, key):
+        """
+        Remove an entry - O(1)
+        Returns: True if deleted, False if not found
+        """
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return False
+            self._remove(entry)
+            return True
+    
+    def contains(self, key):
+        """Check if key is cached and not expired (recency unchanged)"""
+        with self._lock:
+            return self._live(key) is not None
+    
+    def keys(self):
+        """Keys from least to most recently used (expired ones included)"""
+        with self._lock:
+            result = []
+            entry = self._root.next
+            while entry is not self._root:
+                result.append(entry.key)
+                entry = entry.next
+            return result
     
     def clear(self):
         """Clear cache"""
-        self.cache.clear()
-        self.access_order = []
+        with self._lock:
+            self.cache.clear()
+            self._root.prev = self._root.next = self._root
+            self._bytes = 0
+    
+    @property
+    def bytes_used(self):
+        """Approximate bytes held by cached values"""
+        return self._bytes
+    
+    def stats(self):
+        """
+        Get cache statistics
+        Returns:
+            Dictionary with hits, misses, hit_rate, evictions, expirations,
+            entries and bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'entries': len(self.cache),
+                'bytes': self._bytes,
+                'capacity': self.capacity,
+                'max_bytes': self.max_bytes
+            }
+    
+    def __contains__(self, key):
+        return self.contains(key)
     
     def __len__(self):
         return len(self.cache)
+    
+    def __repr__(self):
+        return f"LRUCache(entries={len(self.cache)}, capacity={self.capacity})"
@@ -6,32 +6,66 @@ Used for: Request processing, task scheduling, breadth-first search
 
 class Queue:
     """
-    Custom Queue implementation using Python list
-    Demonstrates: FIFO principle, basic queue operations
+    Custom Queue implementation using a growable circular buffer
+    Items sit in a list used as a ring, as in CircularQueue, so dequeue
+    only moves the front index instead of shifting every item. The buffer
+    doubles when full and halves when it is a quarter full.
+    Demonstrates: FIFO principle, basic queue operations, amortized resizing
     """
     
-    def __init__(self):
-        self._items = []
+    MIN_CAPACITY = 16
+    
+    def __init__(self, capacity=MIN_CAPACITY):
+        """
+        Initialize queue
+        Args:
+            capacity: Initial buffer size (the buffer never shrinks below it)
+        """
+        self._min_capacity = max(capacity, 1)
+        self._items = [None] * self._min_capacity
+        self._front = 0
+        self._count = 0
     
     def enqueue(self, item):
         """
-        Add item to rear of queue - O(1)
+        Add item to rear of queue - O(1) amortized
         Args:
             item: Any data to add to queue
         """
-        self._items.append(item)
+        if self._count == len(self._items):
+            self._resize(len(self._items) * 2)
+        
+        self._items[(self._front + self._count) % len(self._items)] = item
+        self._count += 1
     
     def dequeue(self):
         """
-        Remove and return front item - O(n) but acceptable for small queues
+        Remove and return front item - O(1) amortized
         Returns:
             Front item from queue
         Raises:
             IndexError: If queue is empty
         """
-        if self.is_empty():
+        if self._count == 0:
             raise IndexError("Cannot dequeue from empty queue")
-        return self._items.pop(0)
+        
+        items = self._items
+        item = items[self._front]
+        items[self._front] = None  # Don't keep a reference to the item
+        self._front = (self._front + 1) % len(items)
+        self._count -= 1
+        
+        if self._count * 4 <= len(items) and len(items) > self._min_capacity:
+            self._resize(max(len(items) // 2, self._min_capacity))
+        return item
+    
+    def _resize(self, capacity):
+        """
+        Copy items, front first, into a buffer of the given capacity
+        Demonstrates: dynamic resizing
+        """
+        self._items = self.to_list() + [None] * (capacity - self._count)
+        self._front = 0
     
     def front(self):
         """
@@ -43,7 +77,7 @@ class Queue:
         """
         if self.is_empty():
             raise IndexError("Cannot peek empty queue")
-        return self._items[0]
+        return self._items[self._front]
     
     def rear(self):
         """
@@ -53,41 +87,52 @@ class Queue:
         """
         if self.is_empty():
             raise IndexError("Cannot peek empty queue")
-        return self._items[-1]
+        return self._items[(self._front + self._count - 1) % len(self._items)]
     
     def is_empty(self):
         """Check if queue is empty"""
-        return len(self._items) == 0
+        return self._count == 0
     
     def size(self):
         """Return number of items in queue"""
-        return len(self._items)
+        return self._count
     
     def clear(self):
         """Remove all items from queue"""
-        self._items = []
+        self._items = [None] * self._min_capacity
+        self._front = 0
+        self._count = 0
     
     def to_list(self):
         """Return queue contents as list (front to rear)"""
-        return self._items.copy()
+        items = self._items
+        end = self._front + self._count
+        if end <= len(items):
+            return items[self._front:end]
+        # Items wrap around the end of the buffer
+        return items[self._front:] + items[:end - len(items)]
     
     def __len__(self):
         """Return queue size"""
-        return len(self._items)
+        return self._count
     
     def __bool__(self):
         """Return True if queue is not empty"""
         return not self.is_empty()
     
+    def __iter__(self):
+        """Iterate from front to rear"""
+        return iter(self.to_list())
+    
     def __repr__(self):
         """Developer-friendly representation"""
-        return f"Queue({self._items})"
+        return f"Queue({self.to_list()})"
     
     def __str__(self):
         """User-friendly representation"""
         if self.is_empty():
             return "Queue: []"
-        items = " <- ".join(str(item) for item in self._items)
+        items = " <- ".join(str(item) for item in self.to_list())
         return f"Queue: [FRONT {items} REAR]"
 
 
@@ -0,0 +1,183 @@
+"""
+Custom Trie (Prefix Tree) Implementation
+Used for: Autocomplete, prefix search on names
+Time Complexity: O(m) for insert, search, delete (m = key length)
+"""
+
+
+class TrieNode:
+    """Node class for Trie - one node per character"""
+    
+    def __init__(self):
+        self.children = {}  # {char: TrieNode}
+        self.key = None     # Original key stored at end-of-word nodes
+        self.value = None   # Value stored at end-of-word nodes
+        self.is_end = False
+    
+    def __repr__(self):
+        return f"TrieNode(key={self.key}, children={len(self.children)})"
+
+
+class Trie:
+    """
+    Custom Trie implementation for prefix lookups
+    Keys are normalized to lower case by default so that completions are
+    case-insensitive, while the first spelling inserted is kept for display.
+    Demonstrates: tree structures, string processing, iterative DFS
+    """
+    
+    def __init__(self, case_sensitive=False):
+        self.root = TrieNode()
+        self.case_sensitive = case_sensitive
+        self._size = 0
+    
+    def _normalize(self, key):
+        """Convert key to the form used for traversal"""
+        key = str(key)
+        return key if self.case_sensitive else key.lower()
+    
+    def _find_node(self, normalized):
+        """Walk down the trie following normalized characters"""
+        node = self.root
+        for char in normalized:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+    
+    def insert(self, key, value=None):
+        """
+        Insert key-value pair into trie - O(m)
+        Args:
+            key: Key (converted to string)
+            value: Associated value (defaults to key)
+        """
+        if value is None:
+            value = key
+        
+        node = self.root
+        for char in self._normalize(key):
+            child = node.children.get(char)
+            if child is None:
+                child = TrieNode()
+                node.children[char] = child
+            node = child
+        
+        if not node.is_end:
+            node.is_end = True
+            node.key = key
+            self._size += 1
+        
+        # Update existing key (keeps first spelling for display)
+        node.value = value
+    
+    def search(self, key):
+        """
+        Search for exact key
+        Returns: Value if found, None otherwise
+        """
+        node = self._find_node(self._normalize(key))
+        if node is None or not node.is_end:
+            return None
+        return node.value
+    
+    def contains(self, key):
+        """Check if key exists in trie"""
+        return self.search(key) is not None
+    
+    def delete(self, key):
+        """
+        Delete key from trie, pruning nodes that no longer lead anywhere
+        Returns: True if deleted, False if not found
+        """
+        normalized = self._normalize(key)
+        
+        # Remember the path so empty nodes can be removed bottom-up
+        path = [self.root]
+        for char in normalized:
+            node = path[-1].children.get(char)
+            if node is None:
+                return False
+            path.append(node)
+        
+        node = path[-1]
+        if not node.is_end:
+            return False
+        
+        node.is_end = False
+        node.key = None
+        node.value = None
+        self._size -= 1
+        
+        for depth in range(len(normalized), 0, -1):
+            node = path[depth]
+            if node.is_end or node.children:
+                break
+            del path[depth - 1].children[normalized[depth - 1]]
+        
+        return True
+    
+    def starts_with(self, prefix, limit=None):
+        """
+        Find keys beginning with prefix, in lexicographic order
+        Stops as soon as `limit` keys are found, so the cost is the prefix
+        walk plus the paths to the first `limit` completions.
+        
+        Args:
+            prefix: Prefix to complete
+            limit: Maximum number of results (None for all)
+        Returns:
+            List of (key, value) tuples
+        """
+        if limit is not None and limit < 1:
+            return []
+        
+        node = self._find_node(self._normalize(prefix))
+        if node is None:
+            return []
+        
+        results = []
+        stack = [node]
+        
+        while stack:
+            node = stack.pop()
+            if node.is_end:
+                results.append((node.key, node.value))
+                if limit is not None and len(results) >= limit:
+                    break
+            
+            # Push in reverse so the smallest character is visited first
+            for char in sorted(node.children, reverse=True):
+                stack.append(node.children[char])
+        
+        return results
+    
+    def inorder_traversal(self):
+        """
+        Return all (key, value) tuples sorted by normalized key
+        Same shape as BinarySearchTree.inorder_traversal
+        """
+        return self.starts_with('')
+    
+    def is_empty(self):
+        """Check if trie is empty"""
+        return self._size == 0
+    
+    def size(self):
+        """Return number of keys"""
+        return self._size
+    
+    def clear(self):
+        """Remove all keys"""
+        self.root = TrieNode()
+        self._size = 0
+    
+    def __len__(self):
+        return self._size
+    
+    def __contains__(self, key):
+        """Support 'in' operator"""
+        return self.contains(key)
+    
+    def __repr__(self):
+        return f"Trie(size={self._size})"
@@ -0,0 +1,379 @@
+"""
+Aggregation - GROUP BY with COUNT, SUM, AVG, MIN, MAX, COUNT DISTINCT
+Computes every aggregate of every group in a single pass over the records
+"""
+
+from .engine import DatabaseException
+from .sorting import value_key
+from .vectorized import np, numeric_array
+
+
+# Below this many records the NumPy setup costs more than it saves
+VECTOR_THRESHOLD = 10000
+
+
+class _Count:
+    """COUNT(field) - non-null values (COUNT(*) passes True for every row)"""
+    __slots__ = ('count',)
+    
+    def __init__(self):
+        self.count = 0
+    
+    def add(self, value):
+        if value is not None:
+            self.count += 1
+    
+    def merge(self, other):
+        self.count += other.count
+    
+    def result(self):
+        return self.count
+
+
+class _Sum:
+    """SUM(field) - None when the group has no values"""
+    __slots__ = ('total', 'seen')
+    
+    def __init__(self):
+        self.total = 0
+        self.seen = False
+    
+    def add(self, value):
+        if value is not None:
+            self.total += value
+            self.seen = True
+    
+    def merge(self, other):
+        if other.seen:
+            self.total += other.total
+            self.seen = True
+    
+    def result(self):
+        return self.total if self.seen else None
+
+
+class _Avg:
+    """AVG(field) - running total and count"""
+    __slots__ = ('total', 'count')
+    
+    def __init__(self):
+        self.total = 0
+        self.count = 0
+    
+    def add(self, value):
+        if value is not None:
+            self.total += value
+            self.count += 1
+    
+    def merge(self, other):
+        self.total += other.total
+        self.count += other.count
+    
+    def result(self):
+        return self.total / self.count if self.count else None
+
+
+class _Min:
+    """MIN(field) - smallest value in ORDER BY order (mixed types don't raise)"""
+    __slots__ = ('value', 'key')
+    
+    def __init__(self):
+        self.value = None
+        self.key = None
+    
+    def add(self, value):
+        if value is not None:
+            key = value_key(value)
+            if self.key is None or key < self.key:
+                self.value = value
+                self.key = key
+    
+    def merge(self, other):
+        if other.key is not None and (self.key is None or other.key < self.key):
+            self.value = other.value
+            self.key = other.key
+    
+    def result(self):
+        return self.value
+
+
+class _Max:
+    """MAX(field) - largest value in ORDER BY order (mixed types don't raise)"""
+    __slots__ = ('value', 'key')
+    
+    def __init__(self):
+        self.value = None
+        self.key = None
+    
+    def add(self, value):
+        if value is not None:
+            key = value_key(value)
+            if self.key is None or key > self.key:
+                self.value = value
+                self.key = key
+    
+    def merge(self, other):
+        if other.key is not None and (self.key is None or other.key > self.key):
+            self.value = other.value
+            self.key = other.key
+    
+    def result(self):
+        return self.value
+
+
+class _CountDistinct:
+    """COUNT(DISTINCT field)"""
+    __slots__ = ('values',)
+    
+    def __init__(self):
+        self.values = set()
+    
+    def add(self, value):
+        if value is not None:
+            self.values.add(value)
+    
+    def merge(self, other):
+        self.values |= other.values
+    
+    def result(self):
+        return len(self.values)
+
+
+# Aggregate function name -> accumulator class
+AGGREGATES = {
+    'count': _Count,
+    'sum': _Sum,
+    'avg': _Avg,
+    'min': _Min,
+    'max': _Max,
+    'count_distinct': _CountDistinct,
+}
+
+
+class AggregateSpec:
+    """One output column: alias = function(field)"""
+    
+    def __init__(self, alias, function, field):
+        self.alias = alias
+        self.function = function
+        self.field = field
+    
+    def __repr__(self):
+        return f"AggregateSpec({self.alias}={self.function}({self.field}))"
+
+
+def parse_aggregates(aggregates):
+    """
+    Validate aggregate definitions
+    Args:
+        aggregates: {alias: (function, field)} e.g. {'total': ('sum', 'budget')}
+    Returns:
+        List of AggregateSpec
+    Raises:
+        DatabaseException: If a definition or function is invalid
+    """
+    if not aggregates:
+        raise DatabaseException("At least one aggregate is required")
+    
+    specs = []
+    for alias, definition in aggregates.items():
+        if not isinstance(definition, (tuple, list)) or len(definition) != 2:
+            raise DatabaseException(f"Aggregate '{alias}' must be a (function, field) pair")
+        
+        function, field = definition
+        function = str(function).lower()
+        if function not in AGGREGATES:
+            raise DatabaseException(f"Unsupported aggregate: {function}")
+        if field == '*' and function != 'count':
+            raise DatabaseException(f"'*' is only valid with count, not {function}")
+        
+        specs.append(AggregateSpec(alias, function, field))
+    
+    return specs
+
+
+def aggregate_records(records, group_fields, specs):
+    """
+    Group records and compute aggregates
+    Large lists of numeric values are aggregated with NumPy when it is
+    installed; everything else uses one streaming pass in pure Python.
+    Groups are returned in the order they are first seen.
+    
+    Args:
+        records: Iterable of records (a list enables the NumPy path)
+        group_fields: Field names to group by (empty for one overall row)
+        specs: List of AggregateSpec from parse_aggregates()
+    Returns:
+        List of dictionaries with group fields and aggregate aliases
+    """
+    if np is not None and isinstance(records, list) and len(records) >= VECTOR_THRESHOLD:
+        return _aggregate_vectorized(records, group_fields, specs)
+    return _aggregate_streaming(records, group_fields, specs)
+
+
+def _aggregate_streaming(records, group_fields, specs):
+    """Single pass with one accumulator per (group, aggregate)"""
+    return finish_groups(accumulate(records, group_fields, specs), group_fields, specs)
+
+
+def accumulate(records, group_fields, specs):
+    """
+    Feed records into per-group accumulators
+    Partial results from separate partitions can be combined with
+    merge_groups() before finish_groups()
+    
+    Returns:
+        {group key tuple: [accumulator per spec]} in first-seen order
+    """
+    factories = [AGGREGATES[spec.function] for spec in specs]
+    fields = [spec.field for spec in specs]
+    groups = {}
+    
+    for record in records:
+        key = tuple(record.get(field) for field in group_fields)
+        accumulators = groups.get(key)
+        if accumulators is None:
+            accumulators = [factory() for factory in factories]
+            groups[key] = accumulators
+        
+        for accumulator, field in zip(accumulators, fields):
+            accumulator.add(True if field == '*' else record.get(field))
+    
+    return groups
+
+
+def merge_groups(partials):
+    """Combine accumulate() results of consecutive partitions, in order"""
+    merged = {}
+    for groups in partials:
+        for key, accumulators in groups.items():
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = accumulators
+            else:
+                for target, accumulator in zip(existing, accumulators):
+                    target.merge(accumulator)
+    return merged
+
+
+def finish_groups(groups, group_fields, specs):
+    """Turn accumulators into result rows"""
+    # Without GROUP BY an empty input still yields one row (COUNT = 0)
+    if not group_fields and not groups:
+        groups = {(): [AGGREGATES[spec.function]() for spec in specs]}
+    
+    rows = []
+    for key, accumulators in groups.items():
+        row = dict(zip(group_fields, key))
+        for spec, accumulator in zip(specs, accumulators):
+            row[spec.alias] = accumulator.result()
+        rows.append(row)
+    
+    return rows
+
+
+def _aggregate_vectorized(records, group_fields, specs):
+    """
+    Group codes are assigned in one pass, then each aggregate is a single
+    NumPy reduction (bincount / ufunc.at) over the whole column
+    """
+    group_codes = {}
+    codes = np.fromiter(
+        (group_codes.setdefault(tuple(r.get(f) for f in group_fields), len(group_codes))
+         for r in records),
+        dtype=np.intp, count=len(records))
+    group_count = len(group_codes)
+    
+    columns = {}  # field -> (values list, present mask, numeric array or None)
+    
+    def column(field):
+        if field not in columns:
+            values = [record.get(field) for record in records]
+            present = np.fromiter((v is not None for v in values), dtype=bool, count=len(values))
+            columns[field] = (values, present, None)
+        return columns[field]
+    
+    def numeric(field):
+        values, present, array = column(field)
+        if array is None:
+            array = numeric_array(values)
+            columns[field] = (values, present, array)
+        return values, present, array
+    
+    results = {}
+    for spec in specs:
+        if spec.field == '*':
+            results[spec.alias] = np.bincount(codes, minlength=group_count).tolist()
+            continue
+        
+        values, present, array = column(spec.field)
+        counts = np.bincount(codes[present], minlength=group_count)
+        
+        if spec.function == 'count':
+            results[spec.alias] = counts.tolist()
+            continue
+        
+        if spec.function == 'count_distinct':
+            distinct = [set() for _ in range(group_count)]
+            for code, value in zip(codes.tolist(), values):
+                if value is not None:
+                    distinct[code].add(value)
+            results[spec.alias] = [len(seen) for seen in distinct]
+            continue
+        
+        values, present, array = numeric(spec.field)
+        if array is None:
+            # Strings, bools, mixed types... - same accumulators as the streaming path
+            results[spec.alias] = _aggregate_column(codes, values, group_count, spec.function)
+            continue
+        
+        results[spec.alias] = _reduce(spec.function, codes, present, array, counts, group_count)
+    
+    rows = []
+    for key, code in group_codes.items():
+        row = dict(zip(group_fields, key))
+        for spec in specs:
+            row[spec.alias] = results[spec.alias][code]
+        rows.append(row)
+    
+    return rows
+
+
+def _reduce(function, codes, present, array, counts, group_count):
+    """One vectorized SUM / AVG / MIN / MAX per group"""
+    codes = codes[present]
+    array = array[present]
+    empty = counts == 0
+    
+    if function in ('sum', 'avg'):
+        if array.dtype == np.int64:
+            totals = np.zeros(group_count, dtype=np.int64)
+            np.add.at(totals, codes, array)
+        else:
+            totals = np.bincount(codes, weights=array, minlength=group_count)
+        
+        if function == 'sum':
+            values = totals.tolist()
+        else:
+            values = (totals / np.maximum(counts, 1)).tolist()
+    else:
+        if array.dtype == np.int64:
+            limits = np.iinfo(np.int64)
+            start = limits.max if function == 'min' else limits.min
+        else:
+            start = np.inf if function == 'min' else -np.inf
+        
+        extremes = np.full(group_count, start, dtype=array.dtype)
+        reducer = np.minimum if function == 'min' else np.maximum
+        reducer.at(extremes, codes, array)
+        values = extremes.tolist()
+    
+    return [None if is_empty else value for value, is_empty in zip(values, empty.tolist())]
+
+
+def _aggregate_column(codes, values, group_count, function):
+    """Per-group accumulators for a single non-numeric column"""
+    accumulators = [AGGREGATES[function]() for _ in range(group_count)]
+    for code, value in zip(codes.tolist(), values):
+        accumulators[code].add(value)
+    return [accumulator.result() for accumulator in accumulators]
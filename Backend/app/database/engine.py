@@ -17,12 +17,68 @@ class DatabaseException(Exception):
     pass
 
 
+class RecordView(dict):
+    """
+    Read-only record shared between queries
+    A dict subclass (so it still works with json.dumps, ** and isinstance)
+    whose mutating methods raise TypeError. copy() / dict(view) give a
+    normal mutable dict. Nested objects are RecordViews too and nested
+    lists are tuples (see freeze_record), so nothing inside can change.
+    """
+    __slots__ = ()
+    
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Record views are read-only; use dict(record) for a mutable copy")
+    
+    __setitem__ = __delitem__ = _read_only
+    update = pop = popitem = setdefault = clear = _read_only
+    __ior__ = _read_only
+    
+    def __copy__(self):
+        return dict(self)
+    
+    def __reduce__(self):
+        # copy.deepcopy / pickle produce plain (mutable) dicts
+        return (dict, (dict(self),))
+
+
+def freeze_list(values):
+    """Tuple of a JSON list, with nested lists frozen as well"""
+    return tuple(freeze_list(value) if isinstance(value, list) else value for value in values)
+
+
+def freeze_record(obj):
+    """
+    json object_hook building read-only records
+    Objects become RecordViews and their list values tuples, so callers
+    can't change a shared snapshot through e.g. record['tags'].append().
+    Nested objects were already converted by the time their parent is.
+    """
+    for key, value in obj.items():
+        if isinstance(value, list):
+            obj[key] = freeze_list(value)
+    return RecordView(obj)
+
+
 class DatabaseEngine:
     """
     Custom file-based database engine
     Uses JSON files for storage with thread-safe operations
     """
     
+    # Writes per table file made by this process, shared by all engines.
+    # Part of table_version() so two writes within one mtime tick still differ.
+    _write_counts = {}
+    
+    # Parsed read-only tables shared by all engines:
+    # {file path: (version, records, {id: position} or None until first needed)}
+    _snapshots = {}
+    _snapshot_lock = Lock()
+    
+    # Engines returned by shared(): {resolved storage path: DatabaseEngine}
+    _shared = {}
+    _shared_lock = Lock()
+    
     def __init__(self, storage_path="app/storage/data"):
         """
         Initialize database engine
@@ -44,6 +100,30 @@ class DatabaseEngine:
         
         # Thread locks for each table
         self.locks = {}
+        
+        # Table objects shared by everything using this engine (Table.shared)
+        self.tables = {}
+        self.tables_lock = Lock()
+    
+    @classmethod
+    def shared(cls, storage_path="app/storage/data"):
+        """
+        Engine for a storage path, created once per process
+        Avoids re-creating directories (and per-engine table locks) every
+        time a model or query needs the database.
+        
+        Args:
+            storage_path: Directory path for database files
+        Returns:
+            DatabaseEngine
+        """
+        key = str(Path(storage_path).resolve())
+        with cls._shared_lock:
+            engine = cls._shared.get(key)
+            if engine is None:
+                engine = cls(storage_path)
+                cls._shared[key] = engine
+        return engine
     
     def _get_file_path(self, table_name):
         """
@@ -111,6 +191,10 @@ class DatabaseEngine:
         Returns:
             List of records (dictionaries)
         """
+        return self._parse_table(table_name)
+    
+    def _parse_table(self, table_name, object_hook=None):
+        """Load and parse a table file (object_hook is passed to json.load)"""
         file_path = self._get_file_path(table_name)
         
         if not file_path.exists():
@@ -120,13 +204,96 @@ class DatabaseEngine:
         
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+                data = json.load(f, object_hook=object_hook)
                 return data if isinstance(data, list) else []
         except json.JSONDecodeError as e:
             raise DatabaseException(f"Invalid JSON in table '{table_name}': {str(e)}")
         except Exception as e:
             raise DatabaseException(f"Error reading table '{table_name}': {str(e)}")
     
+    def table_version(self, table_name):
+        """
+        Fingerprint of a table file that changes on every write
+        Used to know when cached data derived from a table is stale
+        
+        Args:
+            table_name: Name of table
+        Returns:
+            Hashable version tuple, or None if the table doesn't exist
+        """
+        file_path = self._get_file_path(table_name)
+        
+        try:
+            stats = file_path.stat()
+        except FileNotFoundError:
+            return None
+        
+        writes = DatabaseEngine._write_counts.get(str(file_path), 0)
+        return (writes, stats.st_ino, stats.st_mtime_ns, stats.st_size)
+    
+    def read_table_shared(self, table_name):
+        """
+        Read table as shared read-only records
+        The file is parsed once per table version and the same RecordView
+        objects are returned to every reader until the table is written,
+        so queries don't re-parse or copy records. List values come back
+        as tuples.
+        
+        Args:
+            table_name: Name of table to read
+        Returns:
+            (records, version) - records must not be modified
+        """
+        key = str(self._get_file_path(table_name))
+        version = self.table_version(table_name)
+        
+        with DatabaseEngine._snapshot_lock:
+            cached = DatabaseEngine._snapshots.get(key)
+        if version is not None and cached is not None and cached[0] == version:
+            return cached[1], version
+        
+        records = self._parse_table(table_name, object_hook=freeze_record)
+        if self.table_version(table_name) != version:
+            # Written while parsing - don't share a snapshot of unknown version
+            return records, None
+        
+        with DatabaseEngine._snapshot_lock:
+            DatabaseEngine._snapshots[key] = (version, records, None)
+        return records, version
+    
+    def shared_positions(self, table_name, records):
+        """
+        {id: position in records} for records returned by read_table_shared
+        Built once per snapshot and shared like the records, so an index
+        lookup doesn't rebuild it over the whole table. Records that are
+        not the current snapshot get a fresh map.
+        
+        Args:
+            table_name: Name of table
+            records: Records list from read_table_shared()
+        Returns:
+            Dictionary of id -> list position (must not be modified)
+        """
+        key = str(self._get_file_path(table_name))
+        
+        with DatabaseEngine._snapshot_lock:
+            cached = DatabaseEngine._snapshots.get(key)
+        if cached is None or cached[1] is not records:
+            return {record.get('id'): i for i, record in enumerate(records)}
+        if cached[2] is not None:
+            return cached[2]
+        
+        positions = {record.get('id'): i for i, record in enumerate(records)}
+        with DatabaseEngine._snapshot_lock:
+            if DatabaseEngine._snapshots.get(key) is cached:
+                DatabaseEngine._snapshots[key] = (cached[0], records, positions)
+        return positions
+    
+    def _mark_written(self, table_name):
+        """Bump this process's write count for a table"""
+        key = str(self._get_file_path(table_name))
+        DatabaseEngine._write_counts[key] = DatabaseEngine._write_counts.get(key, 0) + 1
+    
     def write_table(self, table_name, data):
         """
         Write entire table to file
@@ -156,6 +323,7 @@ class DatabaseEngine:
                 
                 # Atomic rename (safer than direct write)
                 temp_path.replace(file_path)
+                self._mark_written(table_name)
                 
             except Exception as e:
                 # Clean up temp file if it exists
@@ -221,6 +389,7 @@ class DatabaseEngine:
         
         file_path = self._get_file_path(table_name)
         shutil.copy2(backup_file, file_path)
+        self._mark_written(table_name)
         
         self._log(f"Restored table '{table_name}' from backup: {backup_file.name}")
     
@@ -1,11 +1,12 @@
 """
 Index Manager for Fast Lookups
-Uses Binary Search Tree for indexing
+Uses Binary Search Tree for indexing and Trie for prefix (autocomplete) indexes
 """
 
 import json
 from pathlib import Path
 from app.data_structures.binary_search_tree import BinarySearchTree
+from app.data_structures.trie import Trie
 
 
 class IndexManager:
@@ -27,6 +28,17 @@ class IndexManager:
         
         # In-memory indexes (BST for each indexed field)
         self.indexes = {}
+        
+        # In-memory prefix indexes (Trie for each autocomplete field)
+        self.prefix_indexes = {}
+        
+        # Indexes found on disk but not read yet (loaded on first use)
+        self._pending = set()
+        self._pending_prefix = set()
+        
+        # Table version (DatabaseEngine.table_version) the indexes describe;
+        # None if unknown, e.g. after the table was written elsewhere
+        self.version = None
     
     def create_index(self, field_name, records=None):
         """
@@ -37,71 +49,106 @@ class IndexManager:
             field_name: Field to index
             records: List of records to index (optional)
         """
-        bst = BinarySearchTree()
+        # BST stores key -> list of record IDs (for non-unique fields)
+        # Dict keys keep insertion order and make duplicate checks O(1)
+        grouped = {}
         
         if records:
             for record in records:
                 key = record.get(field_name)
                 if key is not None:
-                    record_id = record.get('id')
-                    
-                    # BST stores key -> list of record IDs (for non-unique fields)
-                    existing = bst.search(key)
-                    if existing:
-                        if record_id not in existing:
-                            existing.append(record_id)
-                        bst.insert(key, existing)
-                    else:
-                        bst.insert(key, [record_id])
-        
-        self.indexes[field_name] = bst
+                    grouped.setdefault(key, {})[record.get('id')] = None
+        
+        # Build from sorted keys so the tree is balanced
+        items = sorted((key, list(ids)) for key, ids in grouped.items())
+        self.indexes[field_name] = BinarySearchTree.from_sorted(items)
+        self._pending.discard(field_name)
         self._save_index(field_name)
     
-    def add_to_index(self, record):
+    def create_prefix_index(self, field_name, records=None):
+        """
+        Create prefix (autocomplete) index on a string field using Trie
+        Keys are matched case-insensitively
+        
+        Args:
+            field_name: Field to index (e.g. 'name')
+            records: List of records to index (optional)
+        """
+        trie = Trie()
+        
+        if records:
+            for record in records:
+                key = record.get(field_name)
+                if key is not None:
+                    self._add_id(trie, key, record.get('id'))
+        
+        self.prefix_indexes[field_name] = trie
+        self._pending_prefix.discard(field_name)
+        self._save_index(field_name, prefix=True)
+    
+    def add_to_index(self, record, save=True):
         """
         Add record to all indexes
         Args:
             record: Record dictionary to index
+            save: Write index files now (pass False when batching, then call save_indexes)
         """
         record_id = record.get('id')
+        self._load_pending()
         
-        for field_name, bst in self.indexes.items():
+        for field_name, structure in self._all_structures():
             key = record.get(field_name)
             if key is not None:
-                existing = bst.search(key)
-                if existing:
-                    if record_id not in existing:
-                        existing.append(record_id)
-                    bst.insert(key, existing)
-                else:
-                    bst.insert(key, [record_id])
+                self._add_id(structure, key, record_id)
         
         # Save updated indexes
-        for field_name in self.indexes:
-            self._save_index(field_name)
+        if save:
+            self.save_indexes()
     
-    def remove_from_index(self, record):
+    def remove_from_index(self, record, save=True):
         """
         Remove record from all indexes
         Args:
             record: Record dictionary to remove
+            save: Write index files now (pass False when batching, then call save_indexes)
         """
         record_id = record.get('id')
+        self._load_pending()
         
-        for field_name, bst in self.indexes.items():
+        for field_name, structure in self._all_structures():
             key = record.get(field_name)
             if key is not None:
-                existing = bst.search(key)
-                if existing and record_id in existing:
-                    existing.remove(record_id)
-                    if existing:
-                        bst.insert(key, existing)
-                    else:
-                        bst.delete(key)
+                self._remove_id(structure, key, record_id)
         
         # Save updated indexes
-        for field_name in self.indexes:
-            self._save_index(field_name)
+        if save:
+            self.save_indexes()
+    
+    @staticmethod
+    def _add_id(structure, key, record_id):
+        """Add record ID under key in a BST or Trie"""
+        existing = structure.search(key)
+        if existing:
+            if record_id not in existing:
+                existing.append(record_id)
+            structure.insert(key, existing)
+        else:
+            structure.insert(key, [record_id])
+    
+    @staticmethod
+    def _remove_id(structure, key, record_id):
+        """Remove record ID under key from a BST or Trie"""
+        existing = structure.search(key)
+        if existing and record_id in existing:
+            existing.remove(record_id)
+            if existing:
+                structure.insert(key, existing)
+            else:
+                structure.delete(key)
+    
+    def _all_structures(self):
+        """List (field_name, structure) pairs for every loaded index"""
+        return list(self.indexes.items()) + list(self.prefix_indexes.items())
     
     def lookup(self, field_name, key):
         """
@@ -114,10 +161,11 @@ class IndexManager:
         Returns:
             List of record IDs matching key
         """
-        if field_name not in self.indexes:
+        bst = self._get_index(field_name)
+        if bst is None:
             return []
         
-        result = self.indexes[field_name].search(key)
+        result = bst.search(key)
         return result if result else []
     
     def range_lookup(self, field_name, min_key, max_key):
@@ -125,72 +173,170 @@ class IndexManager:
         Range lookup using index
         Args:
             field_name: Indexed field name
-            min_key: Minimum key (inclusive)
-            max_key: Maximum key (inclusive)
+            min_key: Minimum key (inclusive), None for unbounded
+            max_key: Maximum key (inclusive), None for unbounded
         Returns:
             List of record IDs in range
         """
-        if field_name not in self.indexes:
-            return []
-        
-        # Get all items in sorted order
-        items = self.indexes[field_name].inorder_traversal()
-        
         record_ids = []
-        for key, ids in items:
-            if min_key <= key <= max_key:
-                record_ids.extend(ids)
+        for key, ids in self.iter_index(field_name, min_key, max_key):
+            record_ids.extend(ids)
         
         return record_ids
     
+    def iter_index(self, field_name, min_key=None, max_key=None, reverse=False):
+        """
+        Lazily walk index entries in key order
+        Only the subtrees overlapping [min_key, max_key] are visited
+        
+        Args:
+            field_name: Indexed field name
+            min_key: Minimum key (inclusive), None for unbounded
+            max_key: Maximum key (inclusive), None for unbounded
+            reverse: Walk in descending key order
+        Returns:
+            Iterator of (key, record_ids) tuples
+        """
+        bst = self._get_index(field_name)
+        if bst is None:
+            return iter(())
+        
+        return bst.iter_range(min_key, max_key, reverse)
+    
+    def has_index(self, field_name):
+        """Check if field has a BST index (loaded or on disk)"""
+        return field_name in self.indexes or field_name in self._pending
+    
+    def key_count(self, field_name):
+        """
+        Number of distinct keys in a field's index (used for statistics)
+        Returns:
+            Distinct key count, or 0 if field is not indexed
+        """
+        bst = self._get_index(field_name)
+        return bst.size() if bst is not None else 0
+    
+    def autocomplete(self, field_name, prefix, limit=10):
+        """
+        Prefix lookup using Trie index
+        Demonstrates: Trie search, O(prefix length + k) completions
+        
+        Args:
+            field_name: Field with a prefix index
+            prefix: Text typed so far
+            limit: Maximum number of distinct keys to return
+        Returns:
+            List of (key, record_ids) tuples in alphabetical order
+        """
+        trie = self._get_index(field_name, prefix=True)
+        if trie is None:
+            return []
+        
+        return trie.starts_with(prefix, limit)
+    
     def drop_index(self, field_name):
         """
         Drop index on field
         Args:
             field_name: Field to drop index for
         """
-        if field_name in self.indexes:
-            del self.indexes[field_name]
+        if field_name in self.indexes or field_name in self._pending:
+            self.indexes.pop(field_name, None)
+            self._pending.discard(field_name)
             
             # Delete index file
             index_file = self._get_index_file(field_name)
             if index_file.exists():
                 index_file.unlink()
     
+    def drop_prefix_index(self, field_name):
+        """
+        Drop prefix index on field
+        Args:
+            field_name: Field to drop prefix index for
+        """
+        if field_name in self.prefix_indexes or field_name in self._pending_prefix:
+            self.prefix_indexes.pop(field_name, None)
+            self._pending_prefix.discard(field_name)
+            
+            index_file = self._get_index_file(field_name, prefix=True)
+            if index_file.exists():
+                index_file.unlink()
+    
     def list_indexes(self):
         """
         List all indexed fields
         Returns:
             List of field names
         """
-        return list(self.indexes.keys())
+        return list(self.indexes.keys()) + sorted(self._pending)
+    
+    def list_prefix_indexes(self):
+        """
+        List all fields with a prefix index
+        Returns:
+            List of field names
+        """
+        return list(self.prefix_indexes.keys()) + sorted(self._pending_prefix)
     
-    def _get_index_file(self, field_name):
+    def _get_index(self, field_name, prefix=False):
+        """
+        Get BST (or Trie when prefix=True) for field, loading it from disk on first use
+        Returns:
+            Index structure or None if field is not indexed
+        """
+        indexes = self.prefix_indexes if prefix else self.indexes
+        pending = self._pending_prefix if prefix else self._pending
+        
+        if field_name in pending:
+            pending.discard(field_name)
+            structure = self._load_index(field_name, prefix)
+            if structure is not None:
+                indexes[field_name] = structure
+        
+        return indexes.get(field_name)
+    
+    def _load_pending(self):
+        """Load every index still waiting on disk (needed before writes)"""
+        for field_name in list(self._pending):
+            self._get_index(field_name)
+        for field_name in list(self._pending_prefix):
+            self._get_index(field_name, prefix=True)
+    
+    def _get_index_file(self, field_name, prefix=False):
         """Get path to index file"""
-        return self.index_path / f"{self.table_name}_{field_name}.json"
+        suffix = ".prefix.json" if prefix else ".json"
+        return self.index_path / f"{self.table_name}_{field_name}{suffix}"
+    
+    def save_indexes(self):
+        """Save every loaded index to file"""
+        for field_name in self.indexes:
+            self._save_index(field_name)
+        for field_name in self.prefix_indexes:
+            self._save_index(field_name, prefix=True)
     
-    def _save_index(self, field_name):
+    def _save_index(self, field_name, prefix=False):
         """
         Save index to file
         Demonstrates: file writing, BST serialization
         """
-        if field_name not in self.indexes:
+        indexes = self.prefix_indexes if prefix else self.indexes
+        if field_name not in indexes:
             return
         
-        bst = self.indexes[field_name]
-        index_data = bst.inorder_traversal()
+        index_data = indexes[field_name].inorder_traversal()
         
-        index_file = self._get_index_file(field_name)
+        index_file = self._get_index_file(field_name, prefix)
         
         with open(index_file, 'w', encoding='utf-8') as f:
             json.dump(index_data, f, indent=2)
     
-    def _load_index(self, field_name):
+    def _load_index(self, field_name, prefix=False):
         """
         Load index from file
         Demonstrates: file reading, BST reconstruction
         """
-        index_file = self._get_index_file(field_name)
+        index_file = self._get_index_file(field_name, prefix)
         
         if not index_file.exists():
             return None
@@ -198,19 +344,76 @@ class IndexManager:
         with open(index_file, 'r', encoding='utf-8') as f:
             index_data = json.load(f)
         
-        bst = BinarySearchTree()
-        for key, value in index_data:
-            bst.insert(key, value)
+        if prefix:
+            trie = Trie()
+            for key, value in index_data:
+                trie.insert(key, value)
+            return trie
+        
+        # Files are written in inorder (sorted) order; sorting again is O(n)
+        # for already sorted data and protects against hand-edited files
+        index_data.sort(key=lambda item: item[0])
+        return BinarySearchTree.from_sorted((key, value) for key, value in index_data)
+    
+    def _get_version_file(self):
+        """Get path to the file recording which table file the indexes match"""
+        return self.index_path / f"{self.table_name}.version.json"
+    
+    def save_version(self, version):
+        """
+        Record the table version the indexes now describe
+        Only the file part of the version (inode, mtime, size) is written,
+        since write counts are per process.
+        
+        Args:
+            version: Table version from DatabaseEngine.table_version, or None
+        """
+        self.version = version
+        version_file = self._get_version_file()
+        
+        if version is None:
+            if version_file.exists():
+                version_file.unlink()
+            return
+        
+        with open(version_file, 'w', encoding='utf-8') as f:
+            json.dump(list(version[1:]), f)
+    
+    def load_version(self, version):
+        """
+        Trust the index files if they were saved for the table file as it is now
+        Args:
+            version: Current table version
+        """
+        version_file = self._get_version_file()
+        self.version = None
         
-        return bst
+        if version is None or not version_file.exists():
+            return
+        
+        try:
+            with open(version_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        if saved == list(version[1:]):
+            self.version = version
     
     def load_all_indexes(self):
-        """Load all indexes from files"""
-        for index_file in self.index_path.glob(f"{self.table_name}_*.json"):
-            field_name = index_file.stem.replace(f"{self.table_name}_", "")
-            bst = self._load_index(field_name)
-            if bst:
-                self.indexes[field_name] = bst
+        """
+        Register all indexes found on disk
+        Each index file is only read when the index is first used
+        """
+        file_prefix = f"{self.table_name}_"
+        for index_file in self.index_path.glob(f"{file_prefix}*.json"):
+            field_name = index_file.stem[len(file_prefix):]
+            if field_name.endswith(".prefix"):
+                field_name = field_name[:-len(".prefix")]
+                if field_name not in self.prefix_indexes:
+                    self._pending_prefix.add(field_name)
+            elif field_name not in self.indexes:
+                self._pending.add(field_name)
     
     def rebuild_indexes(self, records):
         """
@@ -218,8 +421,10 @@ class IndexManager:
         Args:
             records: List of all records
         """
-        for field_name in list(self.indexes.keys()):
+        for field_name in self.list_indexes():
             self.create_index(field_name, records)
+        for field_name in self.list_prefix_indexes():
+            self.create_prefix_index(field_name, records)
     
     def __repr__(self):
         return f"IndexManager(table='{self.table_name}', indexes={self.list_indexes()})"
@@ -0,0 +1,183 @@
+"""
+Parallel Scans - partitioned full-table scans across processes
+Large tables are split into contiguous partitions that worker processes
+filter and reduce to a partial result (matching positions, a count,
+group accumulators or a local top-k); the parent merges the partials.
+Workers are forked so they see the already-parsed records without
+pickling them; only row positions and sort keys travel back.
+
+Forking a multi-threaded process (a threaded Flask/gunicorn worker) is
+unsafe: the child only gets the forking thread, so a lock held by any
+other thread at that moment stays locked forever in the child. Scans are
+serialized by a module lock and the workers only run the filter, but
+deployments with threaded workers should raise PARALLEL_THRESHOLD or
+serve with process-based workers.
+"""
+
+import heapq
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from .aggregates import accumulate, merge_groups, finish_groups
+
+
+# Tables smaller than this are scanned in-process (fork + merge cost more)
+PARALLEL_THRESHOLD = 200000
+
+# Upper bound on worker processes per scan
+MAX_WORKERS = 8
+
+# Work of the current pool, set in each worker by _set_job()
+_job = None
+
+# One parallel scan at a time: it already uses every core, and concurrent
+# forks from several threads multiply the fork-after-threads hazard
+_scan_lock = Lock()
+
+
+def parallel_available():
+    """True if partitions can run in forked workers on more than one core"""
+    return (os.cpu_count() or 1) > 1 and 'fork' in multiprocessing.get_all_start_methods()
+
+
+def should_parallelize(row_count):
+    """Check if a scan over row_count records is worth splitting"""
+    return row_count >= PARALLEL_THRESHOLD and parallel_available()
+
+
+def _partitions(row_count, workers):
+    """Split range(row_count) into `workers` contiguous (start, stop) slices"""
+    size = -(-row_count // workers)  # Ceiling division
+    return [(start, min(start + size, row_count)) for start in range(0, row_count, size)]
+
+
+def _run(records, predicate, task, partial, workers=None):
+    """
+    Run `task` on every partition in forked workers
+    Args:
+        records: Records to scan
+        predicate: Compiled filter (None = every record matches)
+        task: 'filter', 'count', 'top_k' or 'aggregate'
+        partial: Extra task arguments
+        workers: Number of processes (default: CPU count, capped)
+    Returns:
+        List of per-partition results, in partition order
+    """
+    workers = workers or min(os.cpu_count() or 1, MAX_WORKERS)
+    partitions = _partitions(len(records), workers)
+    
+    # The job goes to each worker as an initializer argument; with fork it
+    # is inherited by the child process, not pickled
+    job = (records, predicate, task, partial)
+    context = multiprocessing.get_context('fork')
+    with _scan_lock:
+        with ProcessPoolExecutor(max_workers=len(partitions), mp_context=context,
+                                 initializer=_set_job, initargs=(job,)) as pool:
+            return list(pool.map(_scan_partition, partitions))
+
+
+def _set_job(job):
+    """Worker initializer: remember the scan this pool was created for"""
+    global _job
+    _job = job
+
+
+def _scan_partition(bounds):
+    """Worker: filter one partition and reduce it to a partial result"""
+    records, predicate, task, partial = _job
+    start, stop = bounds
+    
+    if task in ('count', 'aggregate'):
+        # Only the partial result travels back, so no positions are needed
+        matches = records[start:stop]
+        if predicate is not None:
+            matches = predicate.filter_many(matches)
+        if task == 'count':
+            return len(matches)
+        group_fields, specs = partial
+        return accumulate(matches, group_fields, specs)
+    
+    positions = range(start, stop)
+    if predicate is not None:
+        positions = [i for i in positions if predicate(records[i])]
+    
+    if task == 'filter':
+        return list(positions)
+    
+    # top_k: keep this partition's best k as (sort key, position) pairs
+    sort_key, k, reverse = partial
+    if reverse:
+        # Negated position keeps ties in table order, as sorted() does
+        best = heapq.nlargest(k, ((sort_key(records[i]), -i) for i in positions))
+        return [(key, -i) for key, i in best]
+    return heapq.nsmallest(k, ((sort_key(records[i]), i) for i in positions))
+
+
+def parallel_filter(records, predicate, workers=None):
+    """
+    Matching records, in table order
+    Args:
+        records: Records to scan
+        predicate: Compiled filter
+        workers: Number of processes (optional)
+    Returns:
+        List of matching records
+    """
+    partials = _run(records, predicate, 'filter', None, workers)
+    return [records[i] for positions in partials for i in positions]
+
+
+def parallel_count(records, predicate, workers=None):
+    """
+    Number of matching records (partition counts are summed)
+    Args:
+        records: Records to scan
+        predicate: Compiled filter (None counts everything)
+        workers: Number of processes (optional)
+    Returns:
+        Count
+    """
+    return sum(_run(records, predicate, 'count', None, workers))
+
+
+def parallel_top_k(records, predicate, sort_key, k, reverse=False, workers=None):
+    """
+    First k matching records in sort order
+    Each partition keeps its own top k; the parent merges them, so the
+    result equals sorted(matches, key=sort_key, reverse=reverse)[:k].
+    
+    Args:
+        records: Records to scan
+        predicate: Compiled filter (None = every record matches)
+        sort_key: Key function (inherited by the forked workers)
+        k: Number of records wanted
+        reverse: Descending order
+        workers: Number of processes (optional)
+    Returns:
+        List of at most k records
+    """
+    partials = _run(records, predicate, 'top_k', (sort_key, k, reverse), workers)
+    candidates = [pair for partial in partials for pair in partial]
+    
+    if reverse:
+        best = heapq.nlargest(k, ((key, -i) for key, i in candidates))
+        return [records[-negated] for _, negated in best]
+    best = heapq.nsmallest(k, candidates)
+    return [records[i] for _, i in best]
+
+
+def parallel_aggregate(records, predicate, group_fields, specs, workers=None):
+    """
+    Grouped aggregates with per-partition filtering and partial accumulators
+    Args:
+        records: Records to scan
+        predicate: Compiled filter (None = every record matches)
+        group_fields: Field names to group by
+        specs: List of AggregateSpec
+        workers: Number of processes (optional)
+    Returns:
+        Result rows, same as aggregate_records() on the matching records
+    """
+    partials = _run(records, predicate, 'aggregate', (group_fields, specs), workers)
+    return finish_groups(merge_groups(partials), group_fields, specs)
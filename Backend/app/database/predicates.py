@@ -0,0 +1,490 @@
+"""
+Predicate Compiler
+Turns WHERE clauses into plain Python functions once per query,
+so records are tested in a single pass without re-parsing operators
+"""
+
+import operator as op
+from .engine import DatabaseException, freeze_list
+
+
+# Operator string -> comparison callable (None values never match these)
+COMPARISONS = {
+    '>': op.gt,
+    '<': op.lt,
+    '>=': op.ge,
+    '<=': op.le,
+}
+
+# Rough relative cost used to evaluate cheap tests first
+OPERATOR_COST = {
+    '=': 0,
+    '!=': 0,
+    '>': 1,
+    '<': 1,
+    '>=': 1,
+    '<=': 1,
+    'IN': 1,
+    'NOT IN': 1,
+    'LIKE': 3,
+}
+
+
+def _membership(value):
+    """
+    Build fast membership container for IN / NOT IN
+    Returns (frozenset or None, original values)
+    """
+    try:
+        return frozenset(value), value
+    except TypeError:
+        # Unhashable values - fall back to a linear scan
+        return None, value
+
+
+def compile_predicate(field, operator, value):
+    """
+    Compile one WHERE clause into a test function
+    Demonstrates: closures, higher-order functions
+    
+    Args:
+        field: Field name
+        operator: Comparison operator (=, !=, >, <, >=, <=, LIKE, IN, NOT IN)
+        value: Value to compare
+    Returns:
+        Function taking a record and returning True if it matches
+    Raises:
+        DatabaseException: If operator is not supported
+    """
+    if operator in ('=', '!=') and isinstance(value, list):
+        # Shared snapshots hold lists as tuples (see engine.freeze_record)
+        value = freeze_list(value)
+    
+    if operator == '=':
+        def test(record):
+            return record.get(field) == value
+        return test
+    
+    if operator == '!=':
+        def test(record):
+            return record.get(field) != value
+        return test
+    
+    if operator in COMPARISONS:
+        compare = COMPARISONS[operator]
+        
+        def test(record):
+            field_value = record.get(field)
+            return field_value is not None and compare(field_value, value)
+        return test
+    
+    if operator == 'LIKE':
+        # Lower-case the needle once instead of once per record
+        needle = str(value).lower()
+        
+        def test(record):
+            field_value = record.get(field)
+            return bool(field_value) and needle in str(field_value).lower()
+        return test
+    
+    if operator in ('IN', 'NOT IN'):
+        members, values = _membership(value)
+        negate = (operator == 'NOT IN')
+        
+        def test(record):
+            field_value = record.get(field)
+            if members is not None:
+                try:
+                    found = field_value in members
+                except TypeError:
+                    # Unhashable field value (e.g. a list)
+                    found = field_value in values
+            else:
+                found = field_value in values
+            return found != negate
+        return test
+    
+    raise DatabaseException(f"Unsupported operator: {operator}")
+
+
+class Param:
+    """
+    Placeholder for a filter value supplied when a prepared query runs
+    Example: where('budget', '<=', Param('max_budget'))
+    """
+    __slots__ = ('name',)
+    
+    def __init__(self, name):
+        self.name = name
+    
+    def __eq__(self, other):
+        return isinstance(other, Param) and other.name == self.name
+    
+    def __hash__(self):
+        return hash(('param', self.name))
+    
+    def __repr__(self):
+        return f"Param({self.name!r})"
+
+
+class Expression:
+    """
+    Base class for WHERE expression trees
+    Supports &, | and ~ as shorthands for and_, or_ and not_
+    """
+    
+    def __and__(self, other):
+        return and_(self, other)
+    
+    def __or__(self, other):
+        return or_(self, other)
+    
+    def __invert__(self):
+        return not_(self)
+
+
+class Condition(Expression):
+    """Leaf expression: field operator value"""
+    
+    def __init__(self, field, operator, value):
+        self.field = field
+        self.operator = operator
+        self.value = value
+    
+    def as_tuple(self):
+        """Return (field, operator, value) filter tuple"""
+        return (self.field, self.operator, self.value)
+    
+    def __repr__(self):
+        return f"Condition({self.field!r}, {self.operator!r}, {self.value!r})"
+
+
+class And(Expression):
+    """All children must match (evaluation stops at the first miss)"""
+    
+    def __init__(self, children):
+        self.children = children
+    
+    def __repr__(self):
+        return f"And({self.children})"
+
+
+class Or(Expression):
+    """Any child must match (evaluation stops at the first hit)"""
+    
+    def __init__(self, children):
+        self.children = children
+    
+    def __repr__(self):
+        return f"Or({self.children})"
+
+
+class Not(Expression):
+    """Child must not match"""
+    
+    def __init__(self, child):
+        self.child = child
+    
+    def __repr__(self):
+        return f"Not({self.child})"
+
+
+def to_expression(item):
+    """Convert a (field, operator, value) tuple into a Condition"""
+    if isinstance(item, Expression):
+        return item
+    if isinstance(item, (tuple, list)) and len(item) == 3:
+        return Condition(*item)
+    raise DatabaseException(f"Invalid filter expression: {item!r}")
+
+
+def and_(*items):
+    """
+    Combine expressions with AND
+    Example: and_(('region', '=', 'North'), ('budget', '<', 3000))
+    """
+    return And([to_expression(item) for item in items])
+
+
+def or_(*items):
+    """
+    Combine expressions with OR
+    Example: or_(('name', 'LIKE', q), ('state', 'LIKE', q))
+    """
+    return Or([to_expression(item) for item in items])
+
+
+def not_(item):
+    """Negate an expression"""
+    return Not(to_expression(item))
+
+
+def filter_fields(item):
+    """Field names referenced by a filter tuple or expression tree"""
+    if isinstance(item, Condition):
+        return [item.field]
+    if isinstance(item, tuple):
+        return [item[0]]
+    if isinstance(item, Not):
+        return filter_fields(item.child)
+    return [field for child in item.children for field in filter_fields(child)]
+
+
+def format_filter(item, mask=False):
+    """
+    SQL-like text for a filter tuple or expression tree (used by EXPLAIN)
+    Example: (name LIKE 'Goa' OR budget < 3000)
+    
+    Args:
+        item: Filter tuple or Expression
+        mask: Show every value as '?' (for logs that must not hold user data)
+    """
+    if isinstance(item, Condition):
+        item = item.as_tuple()
+    if isinstance(item, tuple):
+        field, operator, value = item
+        if isinstance(value, Param):
+            return f"{field} {operator} :{value.name}"
+        if mask:
+            return f"{field} {operator} ?"
+        return f"{field} {operator} {value!r}"
+    if isinstance(item, Not):
+        return f"NOT {format_filter(item.child, mask)}"
+    
+    separator = ' AND ' if isinstance(item, And) else ' OR '
+    return '(' + separator.join(format_filter(child, mask) for child in item.children) + ')'
+
+
+def _filter_cost(item):
+    """Relative cost of a filter tuple or expression (nested trees last)"""
+    if isinstance(item, tuple):
+        return OPERATOR_COST.get(item[1], 2)
+    if isinstance(item, Condition):
+        return OPERATOR_COST.get(item.operator, 2)
+    return 4
+
+
+def resolve(value, params):
+    """
+    Value of a filter, looking up Param placeholders in params
+    Raises:
+        DatabaseException: If a placeholder has no bound value
+    """
+    if isinstance(value, Param):
+        if not params or value.name not in params:
+            raise DatabaseException(f"Missing value for parameter '{value.name}'")
+        return params[value.name]
+    return value
+
+
+def bind_filters(filters, params):
+    """
+    Replace Param placeholders with bound values
+    Args:
+        filters: List of filter tuples / expression trees
+        params: {name: value}
+    Returns:
+        New list of filters (unchanged items are reused)
+    """
+    return [_bind(item, params) for item in filters]
+
+
+def _bind(item, params):
+    """Bind the placeholders of one filter tuple or expression tree"""
+    if isinstance(item, tuple):
+        field, operator, value = item
+        return (field, operator, resolve(value, params)) if isinstance(value, Param) else item
+    if isinstance(item, Condition):
+        if isinstance(item.value, Param):
+            return Condition(item.field, item.operator, resolve(item.value, params))
+        return item
+    if isinstance(item, Not):
+        return Not(_bind(item.child, params))
+    return type(item)([_bind(child, params) for child in item.children])
+
+
+def _compile_closure(item, params=None):
+    """Compile a filter tuple or expression tree into nested closures"""
+    if isinstance(item, Condition):
+        item = item.as_tuple()
+    if isinstance(item, tuple):
+        field, operator, value = item
+        return compile_predicate(field, operator, resolve(value, params))
+    if isinstance(item, Not):
+        test = _compile_closure(item.child, params)
+        return lambda record: not test(record)
+    
+    tests = tuple(_compile_closure(child, params) for child in item.children)
+    if isinstance(item, Or):
+        return lambda record: any(test(record) for test in tests)
+    return lambda record: all(test(record) for test in tests)
+
+
+def _clause_source(index, operator, slots):
+    """
+    Python expression source for one clause of the fused predicate
+    Field names and values become arguments of the generated factory,
+    never inlined into the source
+    """
+    field_name = f"f{index}"
+    const_name = f"c{index}"
+    slots.append(index)
+    
+    if operator == '=':
+        return f"record.get({field_name}) == {const_name}"
+    
+    if operator == '!=':
+        return f"record.get({field_name}) != {const_name}"
+    
+    if operator in COMPARISONS:
+        return f"((v := record.get({field_name})) is not None and v {operator} {const_name})"
+    
+    if operator == 'LIKE':
+        return f"(bool(v := record.get({field_name})) and {const_name} in str(v).lower())"
+    
+    if operator in ('IN', 'NOT IN'):
+        keyword = 'not in' if operator == 'NOT IN' else 'in'
+        return f"record.get({field_name}) {keyword} {const_name}"
+    
+    raise DatabaseException(f"Unsupported operator: {operator}")
+
+
+def _clause_constant(operator, value):
+    """Value as used by the generated code (pre-lowered for LIKE, set for IN)"""
+    if operator == 'LIKE':
+        return str(value).lower()
+    if operator in ('IN', 'NOT IN'):
+        members, values = _membership(value)
+        return members if members is not None else values
+    if isinstance(value, list):
+        return freeze_list(value)
+    return value
+
+
+def _expression_source(item, clauses, slots):
+    """
+    Python source for a filter tuple or expression tree
+    and/or/not map straight onto Python's short-circuiting operators
+    """
+    if isinstance(item, Condition):
+        item = item.as_tuple()
+    
+    if isinstance(item, tuple):
+        clauses.append(item)
+        return _clause_source(len(clauses) - 1, item[1], slots)
+    
+    if isinstance(item, Not):
+        return f"(not {_expression_source(item.child, clauses, slots)})"
+    
+    if not item.children:
+        # Empty AND matches everything, empty OR matches nothing
+        return "True" if isinstance(item, And) else "False"
+    
+    joiner = " or " if isinstance(item, Or) else " and "
+    return "(" + joiner.join(_expression_source(child, clauses, slots) for child in item.children) + ")"
+
+
+def _match_all(record):
+    return True
+
+
+_match_all.filter_many = list
+
+
+class FilterTemplate:
+    """
+    Compiled form of ANDed WHERE clauses whose values can be rebound
+    The clauses are generated as one `and` expression and compiled once,
+    so a record costs one call instead of one operator dispatch per clause.
+    Cheap tests run first so most records are rejected early.
+    
+    bind() only creates new closures over the compiled code, so a query
+    shape can be re-run with new values (Param placeholders) without
+    generating or compiling source again.
+    """
+    
+    def __init__(self, filters):
+        """
+        Compile filters
+        Args:
+            filters: List of (field, operator, value) tuples or Expression trees;
+                values may be Param placeholders
+        Raises:
+            DatabaseException: If an operator is not supported
+        """
+        self.items = sorted(filters, key=_filter_cost)
+        self._clauses = []
+        self._build = None
+        
+        if not self.items:
+            return
+        
+        slots = []
+        expression = ' and '.join(_expression_source(item, self._clauses, slots) for item in self.items)
+        arguments = ''.join(f", f{index}, c{index}" for index in slots)
+        
+        source = (
+            f"def build(slow_path{arguments}):\n"
+            "    def predicate(record):\n"
+            "        try:\n"
+            f"            return {expression}\n"
+            "        except TypeError:\n"
+            "            return slow_path(record)\n"
+            "\n"
+            "    def filter_many(records):\n"
+            "        try:\n"
+            f"            return [record for record in records if {expression}]\n"
+            "        except TypeError:\n"
+            "            return [record for record in records if predicate(record)]\n"
+            "\n"
+            "    return predicate, filter_many\n"
+        )
+        namespace = {}
+        exec(compile(source, '<compiled filters>', 'exec'), namespace)
+        self._build = namespace['build']
+    
+    def bind(self, params=None):
+        """
+        Create the predicate for a set of parameter values
+        Args:
+            params: {name: value} for Param placeholders (optional)
+        Returns:
+            Function taking a record and returning True if all clauses match,
+            with a `filter_many(records)` attribute that runs the same
+            expression inline in a list comprehension (no call per record)
+        """
+        if self._build is None:
+            return _match_all
+        
+        # Per-clause closures handle the rare records the fused code can't
+        # (e.g. an unhashable field value tested against an IN set)
+        tests = tuple(_compile_closure(item, params) for item in self.items)
+        
+        def slow_path(record):
+            for test in tests:
+                if not test(record):
+                    return False
+            return True
+        
+        arguments = []
+        for field, operator, value in self._clauses:
+            arguments.append(field)
+            arguments.append(_clause_constant(operator, resolve(value, params)))
+        
+        predicate, filter_many = self._build(slow_path, *arguments)
+        predicate.filter_many = filter_many
+        return predicate
+
+
+def compile_filters(filters):
+    """
+    Fuse ANDed WHERE clauses into a single predicate function
+    See FilterTemplate for how the predicate is built.
+    
+    Args:
+        filters: List of (field, operator, value) tuples or Expression trees
+    Returns:
+        Function taking a record and returning True if all clauses match
+        (with a `filter_many(records)` attribute for whole lists)
+    """
+    return FilterTemplate(filters).bind()
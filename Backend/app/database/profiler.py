@@ -0,0 +1,196 @@
+"""
+Query Profiling - per-stage timings and the slow-query log
+Used by QueryBuilder.profile() / explain() and for every executed query
+"""
+
+import logging
+import math
+import os
+import time
+from collections import deque
+from datetime import datetime
+from threading import Lock
+
+
+logger = logging.getLogger(__name__)
+
+# Slow-query threshold used when SLOW_QUERY_MS is unset or invalid
+DEFAULT_SLOW_QUERY_MS = 500.0
+
+
+class QueryProfile:
+    """
+    Wall time and row counts for each stage of one query execution
+    Stages are recorded in execution order (read, plan, scan, filter,
+    join, sort, limit...)
+    """
+    
+    def __init__(self, operation):
+        self.operation = operation
+        self.stages = []
+        self.total_ms = None
+    
+    def stage(self, name):
+        """Context manager timing one stage; yields a dict for extra details"""
+        return _Stage(self, name)
+    
+    def to_dict(self):
+        """Profile as a JSON-serializable dictionary"""
+        return {
+            'operation': self.operation,
+            'total_ms': self.total_ms,
+            'stages': [dict(stage) for stage in self.stages]
+        }
+    
+    def __repr__(self):
+        return f"QueryProfile(operation='{self.operation}', stages={len(self.stages)}, total_ms={self.total_ms})"
+
+
+class _Stage:
+    """One timed stage of a QueryProfile"""
+    
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.entry = {'stage': name}
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self.entry
+    
+    def __exit__(self, *exc_info):
+        self.entry['ms'] = round((time.perf_counter() - self.start) * 1000, 3)
+        self.profile.stages.append(self.entry)
+        return False
+
+
+class _NullStage:
+    """Stage used when profiling is off - records nothing"""
+    
+    def __enter__(self):
+        return {}
+    
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_STAGE = _NullStage()
+
+
+class SlowQueryLog:
+    """
+    Records queries slower than a threshold
+    Entries are kept in memory (most recent first out) and appended to
+    slow_queries.log next to the database log. Filter values are logged
+    as '?' unless log_values is set, so user input stays out of the log.
+    Demonstrates: bounded buffers (deque), configuration, file append
+    """
+    
+    def __init__(self, threshold_ms=500, enabled=True, max_entries=100, log_values=False):
+        """
+        Initialize slow-query log
+        Args:
+            threshold_ms: Queries taking at least this long are logged
+            enabled: Turn logging on/off
+            max_entries: Number of entries kept in memory
+            log_values: Log raw filter values instead of '?'
+        """
+        self.threshold_ms = threshold_ms
+        self.enabled = enabled
+        self.log_values = log_values
+        self._entries = deque(maxlen=max_entries)
+        self._lock = Lock()
+    
+    def configure(self, threshold_ms=None, enabled=None, log_values=None):
+        """Change threshold, enable flag and/or raw value logging"""
+        if threshold_ms is not None:
+            self.threshold_ms = threshold_ms
+        if enabled is not None:
+            self.enabled = enabled
+        if log_values is not None:
+            self.log_values = log_values
+    
+    def is_slow(self, elapsed_ms):
+        """True if a query taking elapsed_ms would be logged"""
+        return self.enabled and elapsed_ms >= self.threshold_ms
+    
+    def observe(self, table, operation, query, elapsed_ms, log_dir=None):
+        """
+        Log a query if it was slow
+        Args:
+            table: Table name
+            operation: QueryBuilder method ('get', 'count'...)
+            query: SQL-like description of the query
+            elapsed_ms: Wall time in milliseconds
+            log_dir: Directory for slow_queries.log (None = memory only)
+        Returns:
+            True if the query was logged
+        """
+        if not self.is_slow(elapsed_ms):
+            return False
+        
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        entry = {
+            'time': timestamp,
+            'table': table,
+            'operation': operation,
+            'ms': round(elapsed_ms, 3),
+            'query': query
+        }
+        
+        with self._lock:
+            self._entries.append(entry)
+        
+        if log_dir is not None:
+            try:
+                with open(os.path.join(log_dir, 'slow_queries.log'), 'a', encoding='utf-8') as f:
+                    f.write(f"[{timestamp}] {entry['ms']:.1f}ms {operation}: {query}\n")
+            except OSError:
+                # Logging failure shouldn't stop queries
+                pass
+        
+        return True
+    
+    def entries(self):
+        """Logged slow queries, oldest first"""
+        with self._lock:
+            return list(self._entries)
+    
+    def clear(self):
+        """Forget logged entries"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+def threshold_from_env(name='SLOW_QUERY_MS'):
+    """
+    Slow-query threshold in milliseconds from an environment variable
+    A malformed value (e.g. '500ms') must not stop the app from importing,
+    so it falls back to DEFAULT_SLOW_QUERY_MS with a warning.
+    
+    Returns:
+        Non-negative threshold in milliseconds
+    """
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return DEFAULT_SLOW_QUERY_MS
+    
+    try:
+        value = float(raw)
+    except ValueError:
+        value = None
+    
+    if value is None or not math.isfinite(value) or value < 0:
+        logger.warning("Invalid %s=%r; using %s ms", name, raw, DEFAULT_SLOW_QUERY_MS)
+        return DEFAULT_SLOW_QUERY_MS
+    return value
+
+
+# Shared slow-query log; set SLOW_QUERY_MS for the threshold and
+# SLOW_QUERY_LOG_VALUES=true to log raw filter values
+slow_query_log = SlowQueryLog(
+    threshold_ms=threshold_from_env(),
+    log_values=os.getenv('SLOW_QUERY_LOG_VALUES', 'false').lower() in ('1', 'true', 'yes')
+)
@@ -3,7 +3,44 @@ Query Builder - SQL-like query interface
 Provides chainable query methods for filtering, sorting, and pagination
 """
 
+import base64
+import functools
+import heapq
+import json
+import time
+from itertools import groupby, islice
+from .engine import DatabaseException
 from .table import Table
+from .query_planner import QueryPlanner
+from .predicates import compile_filters, filter_fields, bind_filters, Expression, Condition, And, FilterTemplate, or_, format_filter
+from .aggregates import parse_aggregates, aggregate_records
+from .vectorized import vector_filter
+from .query_cache import default_query_cache, make_key
+from .parallel import should_parallelize, parallel_filter, parallel_count, parallel_top_k, parallel_aggregate
+from .profiler import QueryProfile, NULL_STAGE, slow_query_log
+from .sorting import order_column, format_order, sort_key
+
+
+def _executor(method):
+    """
+    Wrap a QueryBuilder method that executes the query
+    Times the call for the slow-query log, records a QueryProfile when
+    profile() is on and serves the result from the cache when cached() is on
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        operation = method.__name__
+        if self._profiling:
+            self._profile = QueryProfile(operation)
+        
+        start = time.perf_counter()
+        try:
+            if self._cache is None:
+                return method(self, *args, **kwargs)
+            return self._cached(operation, (args, kwargs), lambda: method(self, *args, **kwargs))
+        finally:
+            self._finish(operation, (time.perf_counter() - start) * 1000)
+    return wrapper
 
 
 class QueryBuilder:
@@ -19,32 +56,54 @@ class QueryBuilder:
             table: Table instance or table name
         """
         if isinstance(table, str):
-            self.table = Table(table)
+            self.table = Table.shared(table)
         else:
             self.table = table
         
         self._filters = []
-        self._order_by_field = None
-        self._order_direction = 'ASC'
+        self._order = []  # [OrderColumn]
         self._limit_count = None
         self._offset_count = 0
         self._select_fields = None
+        self._group_by_fields = ()
+        self._version = None
+        self._cache = None
+        self._joins = []  # [(Table, left_field, right_field, how)]
+        self._profiling = False
+        self._profile = None
+        self.last_profile = None
     
-    def where(self, field, operator, value):
+    def where(self, field, operator=None, value=None):
         """
         Add WHERE clause
         Demonstrates: method chaining, conditional logic
         
         Args:
-            field: Field name
+            field: Field name, or an expression built with and_/or_/not_
             operator: Comparison operator (=, !=, >, <, >=, <=, LIKE, IN)
             value: Value to compare
         Returns:
             self for chaining
+        
+        Example:
+            query.where(or_(('name', 'LIKE', q), ('state', 'LIKE', q)))
         """
-        self._filters.append((field, operator, value))
+        if isinstance(field, Expression):
+            self._add_expression(field)
+        else:
+            self._filters.append((field, operator, value))
         return self
     
+    def _add_expression(self, expression):
+        """Store expression, flattening top-level ANDs into plain filters"""
+        if isinstance(expression, And):
+            for child in expression.children:
+                self._add_expression(child)
+        elif isinstance(expression, Condition):
+            self._filters.append(expression.as_tuple())
+        else:
+            self._filters.append(expression)
+    
     def where_equal(self, field, value):
         """Shorthand for WHERE field = value"""
         return self.where(field, '=', value)
@@ -69,17 +128,26 @@ class QueryBuilder:
         """WHERE field LIKE pattern (case-insensitive)"""
         return self.where(field, 'LIKE', pattern)
     
-    def order_by(self, field, direction='ASC'):
+    def order_by(self, field, direction='ASC', nulls=None):
         """
-        Add ORDER BY clause
+        Add ORDER BY column
+        Each call adds a column; later columns break ties of earlier ones.
+        Values of different types never raise: nulls sort as the smallest
+        value, then numbers, then strings.
+        
         Args:
             field: Field to sort by
             direction: 'ASC' or 'DESC'
+            nulls: 'FIRST' or 'LAST' (default: first for ASC, last for DESC)
         Returns:
             self for chaining
+        Raises:
+            DatabaseException: If direction or nulls is invalid
+        
+        Example:
+            query.order_by('rating', 'DESC').order_by('name')
         """
-        self._order_by_field = field
-        self._order_direction = direction.upper()
+        self._order.append(order_column(field, direction, nulls))
         return self
     
     def limit(self, count):
@@ -115,132 +183,777 @@ class QueryBuilder:
         self._select_fields = fields
         return self
     
-    def get(self):
+    def join(self, other, left_field, right_field, how='inner'):
         """
-        Execute query and return results
-        Demonstrates: iteration, filtering, sorting, slicing
+        Add JOIN clause, executed as a hash join
+        Fields of the joined table are added to each row as
+        '<table>.<field>' and can be used in where(), order_by() and
+        select(). Only the joined fields the query needs are copied.
         
+        Args:
+            other: Table instance or table name to join
+            left_field: Field of the current rows (may be '<table>.<field>')
+            right_field: Field of the joined table
+            how: 'inner' (drop rows without a match) or 'left' (keep them)
         Returns:
-            List of matching records
+            self for chaining
+        
+        Example:
+            QueryBuilder('reviews').join('users', 'user_id', 'id') \
+                .select('rating', 'users.name').get()
         """
-        # Get all records
-        records = self.table.find_all()
+        how = how.lower()
+        if how not in ('inner', 'left'):
+            raise DatabaseException(f"Unsupported join type: {how}")
         
-        # Apply filters
-        for field, operator, value in self._filters:
-            records = self._apply_filter(records, field, operator, value)
+        if isinstance(other, str):
+            other = Table.shared(other, self.table.engine)
         
-        # Apply ordering
-        if self._order_by_field:
-            reverse = (self._order_direction == 'DESC')
-            records = sorted(
-                records,
-                key=lambda x: x.get(self._order_by_field, ''),
-                reverse=reverse
-            )
+        self._joins.append((other, left_field, right_field, how))
+        return self
+    
+    def prepare(self):
+        """
+        Compile this query for repeated execution with different values
+        Filter values may be Param placeholders, bound on each run. The
+        predicate code, the chosen access path and the sort key are built
+        once and reused.
         
-        # Apply offset and limit
-        if self._offset_count:
-            records = records[self._offset_count:]
-        if self._limit_count:
-            records = records[:self._limit_count]
+        Returns:
+            PreparedQuery
         
-        # Apply field selection
-        if self._select_fields:
-            records = [
-                {field: record.get(field) for field in self._select_fields}
-                for record in records
-            ]
+        Example:
+            by_budget = City.query().where('budget', '<=', Param('max')) \
+                .order_by('rating', 'DESC').limit(10).prepare()
+            by_budget.get(max=3000)
+        """
+        return PreparedQuery(self)
+    
+    def cached(self, cache=None):
+        """
+        Serve this query's results from a result cache
+        Entries are keyed on the query and the table version, so any write
+        to the table makes them stale automatically.
         
-        return records
+        Args:
+            cache: QueryCache to use (default: the shared cache)
+        Returns:
+            self for chaining
+        """
+        self._cache = cache if cache is not None else default_query_cache
+        return self
     
-    def first(self):
+    @staticmethod
+    def cache_stats():
+        """Hit/miss statistics of the shared result cache"""
+        return default_query_cache.stats()
+    
+    def profile(self):
         """
-        Get first matching record
+        Record per-stage timings and row counts for each execution
+        Stages are materialized one after another (no lazy early exit),
+        so a profiled query shows where its time goes rather than how fast
+        it can run. The result of the last run is kept in `last_profile`.
+        
         Returns:
-            First record or None
+            self for chaining
+        
+        Example:
+            query = City.query().where('budget', '<', 3000).profile()
+            query.get()
+            query.last_profile.to_dict()
         """
-        results = self.limit(1).get()
-        return results[0] if results else None
+        self._profiling = True
+        return self
     
-    def count(self):
+    def explain(self, analyze=False):
         """
-        Count matching records
+        Describe how this query will be executed
+        Demonstrates: query plan inspection (like SQL EXPLAIN / EXPLAIN ANALYZE)
+        
+        Args:
+            analyze: Also run the query (bypassing the cache) and report
+                actual rows and wall time of every stage
         Returns:
-            Number of matching records
+            Dictionary with access path, index, used and residual filters,
+            estimated rows, sort strategy and joins (plus 'actual_rows'
+            and 'stages' when analyze is True)
+        """
+        records = self._read()
+        plan = self._plan(records)
+        _, joined_filters = self._split_filters()
+        
+        needs_sort = bool(self._order) and not plan.ordered
+        window = self._offset_count + self._limit_count if self._limit_count else None
+        parallel = self._parallel_scan_allowed(plan, records)
+        
+        if not self._order:
+            sort_method = None
+        elif plan.ordered:
+            sort_method = 'index_then_ties' if len(self._order) > 1 else 'index'
+        elif window and parallel:
+            sort_method = 'parallel_top_k'
+        elif window:
+            sort_method = 'top_k_heap'
+        else:
+            sort_method = 'full_sort'
+        
+        explanation = {
+            'query': self._describe(),
+            'table': self.table.name,
+            'rows_in_table': len(records),
+            'access': plan.access,
+            'index': plan.index_field,
+            'used_filters': [format_filter(item) for item in plan.used_filters],
+            'residual_filters': [format_filter(item) for item in plan.residual_filters],
+            'estimated_rows': plan.estimated_rows,
+            'parallel': parallel,
+            'sort': {
+                'needed': needs_sort,
+                'keys': [format_order(column) for column in self._order],
+                'method': sort_method,
+                'window': window if needs_sort else None
+            },
+            'joins': [
+                {'table': table.name, 'on': f"{left} = {table.name}.{right}", 'type': how}
+                for table, left, right, how in self._joins
+            ],
+            'join_filters': [format_filter(item) for item in joined_filters],
+            'limit': self._limit_count,
+            'offset': self._offset_count
+        }
+        if plan.branches:
+            explanation['branches'] = [
+                {'access': branch.access, 'index': branch.index_field, 'estimated_rows': branch.estimated_rows}
+                for branch in plan.branches
+            ]
+        
+        if analyze:
+            cache, profiling = self._cache, self._profiling
+            self._cache, self._profiling = None, True
+            try:
+                rows = self.get()
+            finally:
+                self._cache, self._profiling = cache, profiling
+            
+            explanation['actual_rows'] = len(rows)
+            explanation['total_ms'] = self.last_profile.total_ms
+            explanation['stages'] = self.last_profile.to_dict()['stages']
+        
+        return explanation
+    
+    def _describe(self, mask=False):
+        """
+        SQL-like text of this query (for EXPLAIN and the slow-query log)
+        Args:
+            mask: Show filter values as '?'
         """
-        # Don't apply limit/offset for count
-        records = self.table.find_all()
+        parts = ['SELECT ' + (', '.join(self._select_fields) if self._select_fields else '*'),
+                 'FROM ' + self.table.name]
         
-        for field, operator, value in self._filters:
-            records = self._apply_filter(records, field, operator, value)
+        for table, left, right, how in self._joins:
+            join_type = 'LEFT JOIN' if how == 'left' else 'JOIN'
+            parts.append(f"{join_type} {table.name} ON {left} = {table.name}.{right}")
+        if self._filters:
+            parts.append('WHERE ' + ' AND '.join(format_filter(item, mask) for item in self._filters))
+        if self._group_by_fields:
+            parts.append('GROUP BY ' + ', '.join(self._group_by_fields))
+        if self._order:
+            parts.append('ORDER BY ' + ', '.join(format_order(column) for column in self._order))
+        if self._limit_count:
+            parts.append(f"LIMIT {self._limit_count}")
+        if self._offset_count:
+            parts.append(f"OFFSET {self._offset_count}")
         
-        return len(records)
+        return ' '.join(parts)
     
-    def exists(self):
+    def _table_key(self):
+        """Identifies the table across Table/engine instances (its file path)"""
+        return str(self.table.engine._get_file_path(self.table.name))
+    
+    def _signature(self):
+        """Everything that determines this query's result"""
+        joins = [(table.name, left, right, how) for table, left, right, how in self._joins]
+        return (self._filters, self._order, self._limit_count, self._offset_count, self._select_fields,
+                self._group_by_fields, joins)
+    
+    def _cached(self, operation, arguments, compute):
         """
-        Check if any records match
+        Look up a result in the cache, computing and storing it on a miss
+        Args:
+            operation: Method name
+            arguments: Method call arguments
+            compute: Function producing the result
         Returns:
-            True if at least one record matches
+            Result (a private copy when served from the cache)
         """
-        return self.count() > 0
+        key = make_key(self._table_key(), operation, (self._signature(), arguments))
+        if key is None:
+            return compute()
+        
+        version = self._tables_version()
+        with self._stage('cache') as stage:
+            hit, result = self._cache.get(key, version)
+            stage['hit'] = hit
+        if hit:
+            return result
+        
+        result = compute()
+        
+        # Only store results computed from the version we looked up
+        if self._version == version[0] and self._tables_version() == version:
+            self._cache.put(key, version, result)
+        return result
+    
+    def _tables_version(self):
+        """Versions of the table and every joined table"""
+        tables = [self.table] + [join[0] for join in self._joins]
+        versions = tuple(table.engine.table_version(table.name) for table in tables)
+        return None if None in versions else versions
+    
+    def _finish(self, operation, elapsed_ms):
+        """Close the profile of an execution and report it if it was slow"""
+        if self._profile is not None:
+            self._profile.total_ms = round(elapsed_ms, 3)
+            self.last_profile = self._profile
+            self._profile = None
+        
+        if slow_query_log.is_slow(elapsed_ms):
+            query = self._describe(mask=not slow_query_log.log_values)
+            slow_query_log.observe(self.table.name, operation, query,
+                                   elapsed_ms, str(self.table.engine.log_path))
+    
+    def _stage(self, name):
+        """Context manager timing one execution stage (no-op unless profiling)"""
+        if self._profile is None:
+            return NULL_STAGE
+        return self._profile.stage(name)
+    
+    def _counted(self, stage, rows):
+        """
+        Record a stage's output row count when profiling
+        Lazy iterables are materialized so their cost lands in this stage
+        """
+        if self._profile is None:
+            return rows
+        if not isinstance(rows, list):
+            rows = list(rows)
+        stage['rows'] = len(rows)
+        return rows
+    
+    def group_by(self, *fields):
+        """
+        Add GROUP BY clause (used by aggregate())
+        Args:
+            *fields: Field names to group by
+        Returns:
+            self for chaining
+        """
+        self._group_by_fields = fields
+        return self
     
-    def _apply_filter(self, records, field, operator, value):
+    @_executor
+    def aggregate(self, **aggregates):
         """
-        Apply single filter to records
-        Demonstrates: conditional logic, string operations
+        Compute grouped aggregates in one pass over the matching records
+        ORDER BY, LIMIT and OFFSET apply to the resulting group rows and
+        may refer to group fields or aggregate aliases.
         
         Args:
-            records: List of records to filter
-            field: Field name
-            operator: Comparison operator
-            value: Value to compare
+            **aggregates: alias=(function, field); functions are count, sum,
+                avg, min, max and count_distinct ('*' counts rows)
         Returns:
-            Filtered list of records
+            List of dictionaries, one per group (one row without GROUP BY)
+        
+        Example:
+            query.group_by('region').aggregate(
+                cities=('count', '*'), avg_budget=('avg', 'budget'))
         """
-        filtered = []
+        specs = parse_aggregates(aggregates)
         
-        for record in records:
-            field_value = record.get(field)
-            
-            if operator == '=':
-                if field_value == value:
-                    filtered.append(record)
+        records = self._read()
+        plan = self._plan(records, ordered=False)
+        
+        if self._parallel_scan_allowed(plan, records):
+            # Each partition filters and aggregates; partial groups are merged
+            predicate = self._compile(plan.residual_filters) if plan.residual_filters else None
+            with self._stage('parallel_aggregate') as stage:
+                rows = parallel_aggregate(records, predicate, self._group_by_fields, specs)
+                stage['rows'] = len(rows)
+        else:
+            if plan.access == 'full_scan' and not plan.residual_filters and not self._joins:
+                matches = records
+            else:
+                matches = self._filtered(plan, records, lazy=False)
             
-            elif operator == '!=':
-                if field_value != value:
-                    filtered.append(record)
+            with self._stage('aggregate') as stage:
+                rows = aggregate_records(matches, self._group_by_fields, specs)
+                stage['rows'] = len(rows)
+        
+        if self._order:
+            with self._stage('sort') as stage:
+                rows = self._sort(rows)
+                stage.update(method='full_sort', rows=len(rows))
+        
+        stop = self._offset_count + self._limit_count if self._limit_count else None
+        return rows[self._offset_count:stop]
+    
+    @_executor
+    def get(self):
+        """
+        Execute query and return results
+        Demonstrates: iteration, filtering, sorting, slicing
+        
+        Returns:
+            List of matching records
+        """
+        return list(self._iterate())
+    
+    def stream(self):
+        """
+        Execute query lazily, yielding one record at a time
+        Records are read through scan -> filter -> project as the caller
+        consumes them, so breaking out early skips the rest of the work
+        (an ORDER BY without a usable index still has to see every match).
+        
+        Yields:
+            Matching records
+        """
+        yield from self._iterate(lazy=True)
+    
+    def _read(self):
+        """
+        Read all table records, remembering the version they were read at
+        Returns:
+            List of records
+        """
+        with self._stage('read') as stage:
+            records, self._version = self.table.snapshot()
+            stage['rows'] = len(records)
+        return records
+    
+    def _plan(self, records, ordered=True):
+        """
+        Choose access path for this query
+        Args:
+            records: All table records
+            ordered: Take ORDER BY into account (False for count/exists)
+        Returns:
+            QueryPlan
+        """
+        with self._stage('plan') as stage:
+            plan = self._choose_plan(records, ordered)
+            stage.update(access=plan.access, index=plan.index_field, estimated_rows=plan.estimated_rows)
+        return plan
+    
+    def _choose_plan(self, records, ordered):
+        """Run the planner for this query (see _plan)"""
+        planner = QueryPlanner(self.table)
+        filters, _ = self._split_filters()
+        
+        if not ordered or not self._order or self._is_joined_field(self._order[0].field):
+            return planner.plan(filters, len(records))
+        
+        # An index can only provide the first ORDER BY column
+        first = self._order[0]
+        return planner.plan(filters, len(records), first.field, first.direction,
+                            nulls_first=(first.nulls == 'FIRST'))
+    
+    def _compile(self, filters):
+        """Compile filters into a predicate (prepared queries reuse templates)"""
+        return compile_filters(filters)
+    
+    def _is_joined_field(self, field):
+        """True if field refers to a joined table ('<table>.<field>')"""
+        if not field or not self._joins:
+            return False
+        return any(field.startswith(join[0].name + '.') for join in self._joins)
+    
+    def _split_filters(self):
+        """
+        Split filters into those on this table and those on joined fields
+        Returns:
+            (local filters, filters to apply after the joins)
+        """
+        if not self._joins:
+            return self._filters, []
+        
+        local, joined = [], []
+        for item in self._filters:
+            if any(self._is_joined_field(field) for field in filter_fields(item)):
+                joined.append(item)
+            else:
+                local.append(item)
+        return local, joined
+    
+    def _matches(self, plan, records, lazy):
+        """
+        Candidate records that pass the remaining filters
+        Args:
+            plan: QueryPlan from _plan()
+            records: All table records
+            lazy: Yield matches one by one (True) or filter in one list pass (False)
+        Returns:
+            Iterable of matching records
+        """
+        if not lazy and plan.access == 'full_scan' and plan.residual_filters:
+            return self._full_scan(records, plan.residual_filters)
+        
+        with self._stage('scan') as stage:
+            stage.update(access=plan.access, method='compiled')
+            candidates = QueryPlanner(self.table).iter_candidates(plan, records)
+            if self._profile is not None:
+                candidates = list(candidates)
+                stage['rows_scanned'] = len(candidates)
             
-            elif operator == '>':
-                if field_value is not None and field_value > value:
-                    filtered.append(record)
+            if not plan.residual_filters:
+                return self._counted(stage, candidates)
             
-            elif operator == '<':
-                if field_value is not None and field_value < value:
-                    filtered.append(record)
+            predicate = self._compile(plan.residual_filters)
+            if lazy:
+                return self._counted(stage, filter(predicate, candidates))
+            return self._counted(stage, predicate.filter_many(candidates))
+    
+    def _full_scan(self, records, filters, count_only=False):
+        """
+        Filter every record of a large or unindexed table
+        Numeric clauses are answered with NumPy masks; otherwise tables
+        above the parallel threshold are split across worker processes.
+        
+        Args:
+            records: All table records
+            filters: Filters to apply (ANDed)
+            count_only: Return the number of matches instead of the records
+        Returns:
+            List of matching records, or their count
+        """
+        with self._stage('scan') as stage:
+            stage.update(access='full_scan', rows_scanned=len(records))
             
-            elif operator == '>=':
-                if field_value is not None and field_value >= value:
-                    filtered.append(record)
+            vectorized = vector_filter(self._table_key(), self._version, records, filters)
+            if vectorized is not None:
+                stage['method'] = 'vectorized'
+                matches, filters = vectorized
+                if filters:
+                    matches = self._compile(filters).filter_many(matches)
+            elif should_parallelize(len(records)):
+                stage['method'] = 'parallel'
+                predicate = self._compile(filters)
+                if count_only:
+                    stage['rows'] = parallel_count(records, predicate)
+                    return stage['rows']
+                matches = parallel_filter(records, predicate)
+            else:
+                stage['method'] = 'compiled'
+                matches = self._compile(filters).filter_many(records)
             
-            elif operator == '<=':
-                if field_value is not None and field_value <= value:
-                    filtered.append(record)
+            stage['rows'] = len(matches)
+        
+        return len(matches) if count_only else matches
+    
+    def _parallel_scan_allowed(self, plan, records):
+        """A full scan without joins over a table big enough to partition"""
+        return plan.access == 'full_scan' and not self._joins and should_parallelize(len(records))
+    
+    def _filtered(self, plan, records, lazy):
+        """
+        Matching rows, joined and filtered on joined fields
+        Same arguments as _matches()
+        """
+        matches = self._matches(plan, records, lazy)
+        if not self._joins:
+            return matches
+        
+        return self._join_rows(matches, lazy)
+    
+    def _join_rows(self, rows, lazy):
+        """Apply every JOIN, then the filters that need joined fields"""
+        for position, join in enumerate(self._joins):
+            with self._stage('join') as stage:
+                stage['table'] = join[0].name
+                # Later joins see rows already trimmed by the first one
+                rows = self._counted(stage, self._hash_join(rows, join, lazy, project_left=(position == 0)))
+        
+        _, joined_filters = self._split_filters()
+        if not joined_filters:
+            return rows
+        
+        with self._stage('join_filter') as stage:
+            predicate = self._compile(joined_filters)
+            if lazy:
+                return self._counted(stage, filter(predicate, rows))
+            return self._counted(stage, predicate.filter_many(rows))
+    
+    def _needed_fields(self):
+        """
+        Fields a joined query still reads after the base-table filters
+        Returns:
+            List of field names, or None for all fields (no select())
+        """
+        if not self._select_fields:
+            return None
+        
+        used = list(self._select_fields) + [join[1] for join in self._joins]
+        used.extend(column.field for column in self._order)
+        for item in self._split_filters()[1]:
+            used.extend(filter_fields(item))
+        
+        return list(dict.fromkeys(used))
+    
+    def _joined_fields(self, table):
+        """
+        Fields of a joined table this query needs
+        Returns:
+            List of field names, or None for all fields (no select())
+        """
+        needed = self._needed_fields()
+        if needed is None:
+            return None
+        
+        prefix = table.name + '.'
+        return [field[len(prefix):] for field in needed if field.startswith(prefix)]
+    
+    def _base_fields(self):
+        """Fields of the base table a joined query needs (None for all)"""
+        needed = self._needed_fields()
+        if needed is None:
+            return None
+        
+        return [field for field in needed if not self._is_joined_field(field)]
+    
+    def _hash_join(self, rows, join, lazy, project_left=False):
+        """
+        Join rows with another table
+        The hash table is built on the smaller side and the other side is
+        streamed through it. Output keeps the order of `rows` (and of the
+        joined table for several matches) whichever side is hashed.
+        
+        Args:
+            rows: Iterable of current rows
+            join: (Table, left_field, right_field, how)
+            lazy: rows is consumed lazily (always hashes the joined table)
+            project_left: Copy only the needed fields of each row (pushdown)
+        Returns:
+            Iterable of joined rows
+        """
+        table, left_field, right_field, how = join
+        prefix = table.name + '.'
+        fields = self._joined_fields(table)
+        right_records, _ = table.snapshot()
+        left_fields = self._base_fields() if project_left else None
+        
+        if fields is None:
+            # Every column seen in the joined table, so all rows get the same
+            # keys (None where a record, or an unmatched LEFT JOIN row, has none)
+            fields = dict.fromkeys(key for record in right_records for key in record)
+        
+        names = [(prefix + field, field) for field in fields]
+        
+        def take(record):
+            return {name: record.get(field) for name, field in names}
+        missing = {name: None for name, _ in names}
+        
+        if left_fields is None:
+            def merge(row, extra):
+                merged = dict(row)
+                merged.update(extra)
+                return merged
+        else:
+            def merge(row, extra):
+                merged = {field: row.get(field) for field in left_fields}
+                merged.update(extra)
+                return merged
+        
+        if lazy or not isinstance(rows, list) or len(rows) >= len(right_records):
+            # Build on the joined table, stream the current rows
+            buckets = {}
+            for record in right_records:
+                key = record.get(right_field)
+                if key is not None:
+                    buckets.setdefault(key, []).append(take(record))
             
-            elif operator == 'LIKE':
-                if field_value and value.lower() in str(field_value).lower():
-                    filtered.append(record)
+            def probe():
+                for row in rows:
+                    try:
+                        found = buckets.get(row.get(left_field))
+                    except TypeError:
+                        found = None  # unhashable value can't match
+                    if found:
+                        for extra in found:
+                            yield merge(row, extra)
+                    elif how == 'left':
+                        yield merge(row, missing)
             
-            elif operator == 'IN':
-                if field_value in value:
-                    filtered.append(record)
+            return probe() if lazy else list(probe())
+        
+        # Build on the current rows, stream the (larger) joined table
+        buckets = {}
+        for position, row in enumerate(rows):
+            key = row.get(left_field)
+            if key is None:
+                continue
+            try:
+                buckets.setdefault(key, []).append(position)
+            except TypeError:
+                continue
+        
+        found = [[] for _ in rows]
+        for record in right_records:
+            key = record.get(right_field)
+            if key is None:
+                continue
+            try:
+                positions = buckets.get(key)
+            except TypeError:
+                continue
+            if positions:
+                extra = take(record)
+                for position in positions:
+                    found[position].append(extra)
+        
+        joined = []
+        for row, extras in zip(rows, found):
+            if extras:
+                joined.extend(merge(row, extra) for extra in extras)
+            elif how == 'left':
+                joined.append(merge(row, missing))
+        return joined
+    
+    def _iterate(self, lazy=False):
+        """
+        Build the iterator chain for this query
+        Args:
+            lazy: Prefer early exit over whole-list filtering
+        Returns:
+            Iterator of result records
+        """
+        records = self._read()
+        plan = self._plan(records)
+        needs_sort = bool(self._order) and not plan.ordered
+        
+        # Sorting needs every match anyway; otherwise a LIMIT can stop early
+        # (profiling runs every stage to completion to count its rows)
+        lazy = not needs_sort and (lazy or bool(self._limit_count)) and self._profile is None
+        window = self._offset_count + self._limit_count if self._limit_count else None
+        
+        if needs_sort and window and self._parallel_scan_allowed(plan, records):
+            # Partition-local top-k lists merged into the global top-k
+            with self._stage('parallel_top_k') as stage:
+                predicate = self._compile(plan.residual_filters) if plan.residual_filters else None
+                key, reverse = self._sort_key()
+                matches = parallel_top_k(records, predicate, key, window, reverse=reverse)
+                stage.update(rows_scanned=len(records), rows=len(matches), window=window)
+        else:
+            matches = self._filtered(plan, records, lazy)
             
-            elif operator == 'NOT IN':
-                if field_value not in value:
-                    filtered.append(record)
+            # Apply ordering (skipped when the index already returned sorted records)
+            if needs_sort:
+                with self._stage('sort') as stage:
+                    matches = self._sort(matches, window)
+                    stage.update(method='top_k_heap' if window else 'full_sort', rows=len(matches))
+            elif plan.ordered and len(self._order) > 1:
+                matches = self._sort_ties(matches)
+        
+        # Apply offset and limit
+        stop = self._offset_count + self._limit_count if self._limit_count else None
+        with self._stage('limit') as stage:
+            if self._offset_count or stop is not None:
+                matches = islice(matches, self._offset_count, stop)
+            matches = self._counted(stage, self._project(matches))
+        
+        return iter(matches)
+    
+    def _sort(self, records, window=None):
+        """
+        Order records by every ORDER BY column in one pass
+        Args:
+            records: Iterable of records
+            window: Only the first `window` rows are needed (None = all)
+        Returns:
+            Sorted list of records
+        """
+        sort_key, reverse = self._sort_key()
+        
+        if window:
+            # Only the first `window` rows are kept: bounded heap, O(n log k)
+            top_k = heapq.nlargest if reverse else heapq.nsmallest
+            return top_k(window, records, key=sort_key)
+        
+        return sorted(records, key=sort_key, reverse=reverse)
+    
+    def _sort_ties(self, records):
+        """
+        Finish an index-ordered scan for a multi-column ORDER BY
+        The index already orders the first column, so only runs of equal
+        first values are sorted by the full key. Runs are consumed one at
+        a time, which keeps a LIMIT able to stop the index walk early.
+        """
+        field = self._order[0].field
+        key, reverse = self._sort_key()
         
-        return filtered
+        for _, run in groupby(records, key=lambda record: record.get(field)):
+            yield from sorted(run, key=key, reverse=reverse)
     
+    def _sort_key(self):
+        """(key function, reverse) for the ORDER BY columns"""
+        return sort_key(self._order)
+    
+    def _project(self, records):
+        """Apply field selection lazily"""
+        if not self._select_fields:
+            return records
+        
+        fields = self._select_fields
+        return ({field: record.get(field) for field in fields} for record in records)
+    
+    @_executor
+    def first(self):
+        """
+        Get first matching record
+        Stops at the first match unless an ORDER BY requires a sort
+        Returns:
+            First record or None
+        """
+        return next(self.limit(1)._iterate(lazy=True), None)
+    
+    @_executor
+    def count(self):
+        """
+        Count matching records
+        Returns:
+            Number of matching records
+        """
+        # Don't apply order/limit/offset for count
+        records = self._read()
+        plan = self._plan(records, ordered=False)
+        
+        if plan.access == 'full_scan' and not plan.residual_filters and not self._joins:
+            return len(records)
+        
+        if plan.access == 'full_scan' and not self._joins:
+            return self._full_scan(records, plan.residual_filters, count_only=True)
+        
+        matches = self._filtered(plan, records, lazy=False)
+        if isinstance(matches, list):
+            return len(matches)
+        return sum(1 for _ in matches)
+    
+    @_executor
+    def exists(self):
+        """
+        Check if any records match
+        Stops at the first match instead of counting all of them
+        Returns:
+            True if at least one record matches
+        """
+        records = self._read()
+        plan = self._plan(records, ordered=False)
+        
+        for _ in self._filtered(plan, records, lazy=True):
+            return True
+        return False
+    
+    @_executor
     def paginate(self, page=1, per_page=10):
         """
         Paginate results
@@ -250,11 +963,26 @@ class QueryBuilder:
         Returns:
             Dictionary with pagination info and data
         """
-        total = self.count()
+        # One read and one filter pass give both the total and the page
+        records = self._read()
+        plan = self._plan(records)
+        
+        matches = self._filtered(plan, records, lazy=False)
+        if not isinstance(matches, list):
+            matches = list(matches)
+        
+        total = len(matches)
         total_pages = (total + per_page - 1) // per_page  # Ceiling division
         
         offset = (page - 1) * per_page
-        records = self.offset(offset).limit(per_page).get()
+        if self._order and not plan.ordered:
+            # Heap keeps only rows up to the end of the requested page
+            with self._stage('sort') as stage:
+                matches = self._sort(matches, offset + per_page)
+                stage.update(method='top_k_heap', rows=len(matches))
+        elif plan.ordered and len(self._order) > 1:
+            matches = list(self._sort_ties(matches))
+        records = list(self._project(matches[offset:offset + per_page]))
         
         return {
             'data': records,
@@ -266,10 +994,214 @@ class QueryBuilder:
             'has_prev': page > 1
         }
     
+    @_executor
+    def paginate_cursor(self, cursor=None, per_page=10):
+        """
+        Keyset (cursor) pagination
+        Instead of skipping `offset` rows, each page continues after the
+        (order value, id) of the previous page's last record. With an index
+        on the ORDER BY field the walk seeks straight to the cursor, so
+        page N costs the same as page 1.
+        
+        Ties on the ORDER BY value are broken by ascending id. Records with
+        no value in the ORDER BY field are not returned. Only one ORDER BY
+        column is supported.
+        
+        Args:
+            cursor: `next_cursor` from the previous page (None for first page)
+            per_page: Records per page
+        Returns:
+            Dictionary with data, next_cursor and has_next
+        """
+        if len(self._order) > 1:
+            raise DatabaseException("Cursor pagination supports a single ORDER BY column")
+        
+        field = self._order[0].field if self._order else 'id'
+        reverse = self._order[0].direction == 'DESC' if self._order else False
+        after = self._decode_cursor(cursor) if cursor else None
+        if self._is_joined_field(field):
+            raise DatabaseException("Cursor pagination can't order by a joined field")
+        
+        records = self._read()
+        planner = QueryPlanner(self.table)
+        
+        if self.table.indexes.has_index(field):
+            rows = planner.iter_keyset(field, after, reverse, records)
+        else:
+            rows = self._keyset_scan(field, after, reverse, records)
+        
+        filters, _ = self._split_filters()
+        if filters:
+            rows = filter(self._compile(filters), rows)
+        if self._joins:
+            rows = self._join_rows(rows, lazy=True)
+        
+        # Fetch one extra row to know whether another page exists
+        page = list(islice(rows, per_page + 1))
+        has_next = len(page) > per_page
+        page = page[:per_page]
+        
+        next_cursor = None
+        if has_next:
+            last = page[-1]
+            next_cursor = self._encode_cursor(last.get(field), last.get('id'))
+        
+        return {
+            'data': list(self._project(page)),
+            'per_page': per_page,
+            'next_cursor': next_cursor,
+            'has_next': has_next
+        }
+    
+    def _keyset_scan(self, field, after, reverse, records):
+        """Keyset order without an index: filter past the cursor, then sort"""
+        rows = [r for r in records if r.get(field) is not None]
+        
+        if after is not None:
+            after_key, after_id = after
+            if reverse:
+                rows = [r for r in rows if r[field] < after_key
+                        or (r[field] == after_key and r.get('id') > after_id)]
+            else:
+                rows = [r for r in rows if r[field] > after_key
+                        or (r[field] == after_key and r.get('id') > after_id)]
+        
+        # Two stable sorts: id ascending within each key, key in requested direction
+        rows.sort(key=lambda r: r.get('id'))
+        rows.sort(key=lambda r: r[field], reverse=reverse)
+        return iter(rows)
+    
+    @staticmethod
+    def _encode_cursor(key, record_id):
+        """Opaque, URL-safe cursor string for (key, id)"""
+        raw = json.dumps([key, record_id]).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+    
+    @staticmethod
+    def _decode_cursor(cursor):
+        """Decode cursor string back into (key, id)"""
+        try:
+            key, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        except (ValueError, TypeError):
+            raise DatabaseException("Invalid pagination cursor")
+        return key, record_id
+    
     def __repr__(self):
         return f"QueryBuilder(table='{self.table.name}')"
 
 
+class PreparedQuery:
+    """
+    Reusable query with Param placeholders, created by QueryBuilder.prepare()
+    The first run with given parameters picks the access path; later runs
+    reuse it (as a prepared SQL statement would) and only refresh the
+    index keys and bounds from the new values.
+    Demonstrates: compilation caching, template method pattern
+    """
+    
+    def __init__(self, builder):
+        """
+        Initialize prepared query
+        Args:
+            builder: QueryBuilder with the query shape (copied, so later
+                changes to the builder don't affect this query)
+        Raises:
+            DatabaseException: If a filter operator is not supported
+        """
+        self.template = QueryBuilder(builder.table)
+        self.template.__dict__.update(builder.__dict__)
+        self.template._filters = list(builder._filters)
+        self.template._joins = list(builder._joins)
+        self.template._order = list(builder._order)
+        
+        # Compile once up front so bad operators fail at prepare() time
+        self._templates = {tuple(range(len(self.template._filters))): FilterTemplate(self.template._filters)}
+        self._plans = {}
+        self._sort_key = self.template._sort_key()
+    
+    def bind(self, **params):
+        """
+        Query for one set of parameter values
+        Args:
+            **params: Values for the Param placeholders
+        Returns:
+            QueryBuilder-compatible query (get, count, paginate, aggregate...)
+        Raises:
+            DatabaseException: If a placeholder has no value
+        """
+        return _BoundQuery(self, params)
+    
+    def get(self, **params):
+        """Run the query and return all results"""
+        return self.bind(**params).get()
+    
+    def first(self, **params):
+        """Run the query and return the first result or None"""
+        return self.bind(**params).first()
+    
+    def count(self, **params):
+        """Count matching records"""
+        return self.bind(**params).count()
+    
+    def exists(self, **params):
+        """Check if any record matches"""
+        return self.bind(**params).exists()
+    
+    def paginate(self, page=1, per_page=10, **params):
+        """Run the query and return one page (see QueryBuilder.paginate)"""
+        return self.bind(**params).paginate(page, per_page)
+    
+    def stream(self, **params):
+        """Run the query lazily (see QueryBuilder.stream)"""
+        return self.bind(**params).stream()
+    
+    def __repr__(self):
+        return f"PreparedQuery(table='{self.template.table.name}', filters={len(self.template._filters)})"
+
+
+class _BoundQuery(QueryBuilder):
+    """One execution of a PreparedQuery, reusing its compiled parts"""
+    
+    def __init__(self, prepared, params):
+        self.__dict__.update(prepared.template.__dict__)
+        self._raw_filters = prepared.template._filters
+        self._filters = bind_filters(self._raw_filters, params)
+        self._params = params
+        self._prepared = prepared
+    
+    def _compile(self, filters):
+        """Bind the compiled template for these filters instead of recompiling"""
+        positions = tuple(i for i, item in enumerate(self._filters)
+                          if any(item is f for f in filters))
+        if len(positions) != len(filters):
+            return compile_filters(filters)
+        
+        templates = self._prepared._templates
+        template = templates.get(positions)
+        if template is None:
+            template = FilterTemplate([self._raw_filters[i] for i in positions])
+            templates[positions] = template
+        return template.bind(self._params)
+    
+    def _choose_plan(self, records, ordered):
+        """Reuse the access path chosen by an earlier execution"""
+        planner = QueryPlanner(self.table)
+        filters, _ = self._split_filters()
+        
+        cached = self._prepared._plans.get(ordered)
+        if cached is not None:
+            plan = planner.replan(cached, filters, len(records))
+            if plan is not None:
+                return plan
+        
+        plan = QueryBuilder._choose_plan(self, records, ordered)
+        self._prepared._plans[ordered] = planner.plan_template(plan, filters)
+        return plan
+    
+    def _sort_key(self):
+        return self._prepared._sort_key
+
+
 class QueryHelper:
     """
     Helper class for common query patterns
@@ -287,21 +1219,12 @@ class QueryHelper:
         Returns:
             List of matching records
         """
-        query = QueryBuilder(table)
-        
-        # This is a simplified OR search
-        # In a real implementation, we'd need proper OR support
-        all_results = []
-        seen_ids = set()
-        
-        for field in fields:
-            results = QueryBuilder(table).where_like(field, search_term).get()
-            for record in results:
-                if record.get('id') not in seen_ids:
-                    all_results.append(record)
-                    seen_ids.add(record.get('id'))
+        if not fields:
+            return []
         
-        return all_results
+        # One pass with an OR of LIKE clauses, stopping at the first matching field
+        conditions = [(field, 'LIKE', search_term) for field in fields]
+        return QueryBuilder(table).where(or_(*conditions)).get()
     
     @staticmethod
     def find_recent(table, limit=10, date_field='created_at'):
@@ -0,0 +1,229 @@
+"""
+Query Result Cache
+Remembers QueryBuilder results keyed on the query signature and the
+version of the table they were computed from, so repeated queries skip
+reading and filtering the table until it is written again
+"""
+
+import sys
+from threading import Lock
+from app.data_structures.hash_table import LRUCache
+from .engine import RecordView
+from .predicates import Condition, And, Or, Not
+
+
+class QueryCache:
+    """
+    LRU cache of query results bounded by entry count and approximate bytes
+    An entry is only served while its table version is current; the first
+    lookup after a write drops every stale entry of that table.
+    Recency and the two limits are handled by an LRUCache.
+    Demonstrates: caching, LRU eviction, invalidation
+    """
+    
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024):
+        """
+        Initialize cache
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Approximate memory budget for cached results
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        
+        # {key: (version, result)}; guarded by self._lock, not its own lock
+        self._entries = LRUCache(max_entries, max_bytes=max_bytes, on_evict=self._evicted)
+        self._table_keys = {}  # {table_key: set of keys}
+        self._lock = Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+    
+    @property
+    def evictions(self):
+        return self._entries.evictions
+    
+    def get(self, key, version):
+        """
+        Look up a result
+        Args:
+            key: Query key from make_key()
+            version: Current table version
+        Returns:
+            (True, copy of result) on a hit, (False, None) on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key) if version is not None else None
+            
+            if entry is None:
+                self.misses += 1
+                return False, None
+            
+            if entry[0] != version:
+                # Table was written since - everything cached for it is stale
+                self._invalidate_locked(key[0], keep_version=version)
+                self.misses += 1
+                return False, None
+            
+            self.hits += 1
+            result = entry[1]
+        
+        return True, copy_result(result)
+    
+    def put(self, key, version, result):
+        """
+        Store a result computed at `version`
+        Results larger than the whole byte budget are not cached.
+        """
+        if version is None:
+            return
+        
+        size = estimate_size(result)
+        if size > self.max_bytes:
+            return
+        
+        stored = copy_result(result)
+        
+        with self._lock:
+            self._table_keys.setdefault(key[0], set()).add(key)
+            # Evicts least recently used results through _evicted()
+            self._entries.put(key, (version, stored), size=size)
+    
+    def invalidate(self, table_key=None):
+        """
+        Drop cached results
+        Args:
+            table_key: Only drop results for this table (None = everything)
+        """
+        with self._lock:
+            if table_key is None:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                self._table_keys.clear()
+            else:
+                self._invalidate_locked(table_key)
+    
+    def _invalidate_locked(self, table_key, keep_version=None):
+        """Remove a table's entries (except those already at keep_version)"""
+        for key in list(self._table_keys.get(table_key, ())):
+            if keep_version is not None and self._entries.peek(key)[0] == keep_version:
+                continue
+            self._remove_locked(key)
+            self.invalidations += 1
+    
+    def _remove_locked(self, key):
+        """Remove one entry and its bookkeeping"""
+        self._entries.delete(key)
+        self._forget(key)
+    
+    def _evicted(self, key, entry):
+        """LRUCache callback: an entry was pushed out by the limits"""
+        self._forget(key)
+    
+    def _forget(self, key):
+        """Drop a key from its table's key set"""
+        keys = self._table_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._table_keys[key[0]]
+    
+    def stats(self):
+        """
+        Get cache statistics
+        Returns:
+            Dictionary with hits, misses, hit_rate, evictions, entries, bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'bytes': self._entries.bytes_used,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes
+            }
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __repr__(self):
+        return f"QueryCache(entries={len(self._entries)}, bytes={self._entries.bytes_used})"
+
+
+def freeze(value):
+    """
+    Hashable, order-normalized form of a filter value or expression
+    Lists become tuples, sets become frozensets, dicts sorted item tuples
+    Raises:
+        TypeError: If the value can't be made hashable
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, Condition):
+        return ('condition',) + freeze(value.as_tuple())
+    if isinstance(value, (And, Or)):
+        return (type(value).__name__.lower(), freeze(value.children))
+    if isinstance(value, Not):
+        return ('not', freeze(value.child))
+    if isinstance(value, (bool, int, float)):
+        # 1, 1.0 and True hash alike but can match differently (e.g. LIKE)
+        return (type(value).__name__, value)
+    
+    hash(value)
+    return value
+
+
+def make_key(table_key, operation, signature):
+    """
+    Build cache key for a query
+    Args:
+        table_key: Identifies the table (its file path)
+        operation: 'get', 'count', 'paginate'...
+        signature: Query parts (filters, order, limit...) plus call arguments
+    Returns:
+        Hashable key, or None if the query contains unhashable values
+    """
+    try:
+        return (table_key, operation, freeze(signature))
+    except TypeError:
+        return None
+
+
+def copy_result(value):
+    """
+    Copy a JSON-like result so callers can't modify cached data
+    Read-only RecordViews are shared as they are
+    """
+    if isinstance(value, RecordView):
+        return value
+    if isinstance(value, dict):
+        return {key: copy_result(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_result(item) for item in value]
+    return value
+
+
+def estimate_size(value):
+    """Approximate memory used by a JSON-like result in bytes"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += sys.getsizeof(key) + estimate_size(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += estimate_size(item)
+    return size
+
+
+# Shared cache used by QueryBuilder.cached()
+default_query_cache = QueryCache()
@@ -0,0 +1,420 @@
+"""
+Query Planner - chooses how a query reads its table
+Uses index statistics to pick the cheapest access path for QueryBuilder
+"""
+
+from .predicates import Condition, And, Or
+
+
+class QueryPlan:
+    """
+    Execution strategy chosen for one query
+    
+    Attributes:
+        access: 'full_scan', 'index_lookup', 'index_range', 'index_union' or 'index_order'
+        index_field: Indexed field used for access (None for full scan)
+        keys: Keys to look up for 'index_lookup'
+        min_key / max_key: Range bounds for 'index_range' (None = unbounded)
+        min_inclusive / max_inclusive: Whether range bounds are inclusive
+        estimated_rows: Estimated number of candidate records
+        used_filters: Filters fully answered by the index
+        residual_filters: Filters still applied to each candidate
+        ordered: True if candidates already come in the requested order
+        reverse: Walk the index in descending order
+        nulls_first: Yield records without the ORDER BY field before the
+            index walk ('index_order'), otherwise after it
+        branches: Sub-plans whose record IDs are merged for 'index_union'
+    """
+    
+    def __init__(self, access='full_scan', index_field=None, estimated_rows=0):
+        self.access = access
+        self.index_field = index_field
+        self.keys = []
+        self.min_key = None
+        self.max_key = None
+        self.min_inclusive = True
+        self.max_inclusive = True
+        self.estimated_rows = estimated_rows
+        self.used_filters = []
+        self.residual_filters = []
+        self.ordered = False
+        self.reverse = False
+        self.nulls_first = True
+        self.branches = []
+    
+    def __repr__(self):
+        return (f"QueryPlan(access='{self.access}', index='{self.index_field}', "
+                f"estimated_rows={self.estimated_rows}, ordered={self.ordered})")
+
+
+class QueryPlanner:
+    """
+    Cost-based planner for the custom database
+    Compares the estimated candidate count of every indexed predicate
+    and reads the table through the most selective one
+    Demonstrates: cost estimation, index usage, strategy selection
+    """
+    
+    RANGE_OPERATORS = ('>', '>=', '<', '<=')
+    
+    # Classic selectivity guesses for ranges (exact counts would need a scan)
+    RANGE_SELECTIVITY = 1 / 3
+    BETWEEN_SELECTIVITY = 1 / 4
+    
+    def __init__(self, table):
+        """
+        Initialize planner
+        Args:
+            table: Table instance whose indexes are used
+        """
+        self.table = table
+        self.indexes = table.indexes
+    
+    def plan(self, filters, row_count, order_by_field=None, order_direction='ASC', nulls_first=None):
+        """
+        Choose access path for a query
+        Args:
+            filters: List of (field, operator, value) tuples (ANDed)
+            row_count: Number of records in the table
+            order_by_field: Requested ORDER BY field (optional)
+            order_direction: 'ASC' or 'DESC'
+            nulls_first: Place records without the field first (default:
+                first for ASC, last for DESC)
+        Returns:
+            QueryPlan
+        """
+        best = self._best_option(filters, row_count)
+        if best is None or best.estimated_rows >= row_count:
+            best = QueryPlan('full_scan', estimated_rows=row_count)
+        
+        best.residual_filters = [f for f in filters if f not in best.used_filters]
+        best.reverse = (order_direction == 'DESC')
+        best.nulls_first = (not best.reverse) if nulls_first is None else nulls_first
+        
+        # An index on the ORDER BY field can replace the sort
+        if order_by_field and self.indexes.has_index(order_by_field):
+            if best.access == 'full_scan':
+                best.access = 'index_order'
+                best.index_field = order_by_field
+                best.ordered = True
+            elif best.index_field == order_by_field:
+                best.ordered = True
+        
+        return best
+    
+    def replan(self, template, filters, row_count):
+        """
+        Rebuild a plan of the same shape for new filter values
+        Used by prepared queries: the access path chosen for the first
+        execution is reused and only its keys / bounds are refreshed,
+        skipping the comparison of every other option.
+        
+        Args:
+            template: (QueryPlan, positions of its used filters) from plan_template()
+            filters: Filters with the new values, parallel to the original list
+            row_count: Number of records in the table
+        Returns:
+            QueryPlan, or None if the shape doesn't apply (re-plan fully)
+        """
+        previous, positions = template
+        access = previous.access
+        
+        if access == 'index_union':
+            return None
+        if previous.index_field and not self.indexes.has_index(previous.index_field):
+            return None
+        
+        used = [filters[i] for i in positions]
+        if access == 'index_lookup':
+            options = self._equality_options(used)
+        elif access == 'index_range':
+            options = self._range_options(used, row_count)
+        else:
+            options = [QueryPlan(access, previous.index_field, row_count)]
+        
+        if len(options) != 1:
+            return None
+        
+        plan = options[0]
+        plan.residual_filters = [f for f in filters if f not in plan.used_filters]
+        plan.ordered = previous.ordered
+        plan.reverse = previous.reverse
+        plan.nulls_first = previous.nulls_first
+        return plan
+    
+    @staticmethod
+    def plan_template(plan, filters):
+        """Remember a plan together with which filters it used (for replan)"""
+        positions = [i for i, item in enumerate(filters)
+                     if any(item is used for used in plan.used_filters)]
+        return plan, positions
+    
+    def _best_option(self, filters, row_count):
+        """Cheapest index-based plan for ANDed filters, or None"""
+        options = (self._equality_options(filters)
+                   + self._range_options(filters, row_count)
+                   + self._union_options(filters, row_count))
+        
+        return min(options, key=lambda option: option.estimated_rows) if options else None
+    
+    def _union_options(self, filters, row_count):
+        """
+        Plans for OR expressions whose every branch can use an index
+        The record IDs of all branches are merged; the OR itself stays a
+        residual filter so candidates are re-checked
+        """
+        options = []
+        
+        for condition in filters:
+            if not isinstance(condition, Or):
+                continue
+            
+            branches = [self._branch_option(child, row_count) for child in condition.children]
+            if not branches or any(branch is None for branch in branches):
+                continue
+            
+            option = QueryPlan('index_union', None, sum(b.estimated_rows for b in branches))
+            option.branches = branches
+            options.append(option)
+        
+        return options
+    
+    def _branch_option(self, expression, row_count):
+        """Best index plan for one OR branch, or None if it needs a scan"""
+        if isinstance(expression, Condition):
+            filters = [expression.as_tuple()]
+        elif isinstance(expression, And):
+            filters = [c.as_tuple() if isinstance(c, Condition) else c for c in expression.children]
+        elif isinstance(expression, Or):
+            filters = [expression]
+        else:
+            return None
+        
+        return self._best_option(filters, row_count)
+    
+    def _equality_options(self, filters):
+        """Plans for '=' and 'IN' predicates - exact counts from the index"""
+        options = []
+        
+        for condition in filters:
+            if not isinstance(condition, tuple):
+                continue
+            field, operator, value = condition
+            if not self.indexes.has_index(field):
+                continue
+            
+            if operator == '=':
+                keys = [value]
+            elif operator == 'IN' and isinstance(value, (list, tuple, set)):
+                keys = list(dict.fromkeys(value))
+            else:
+                continue
+            
+            # Index never stores None, so those predicates must scan
+            if any(key is None for key in keys):
+                continue
+            
+            try:
+                estimated = sum(len(self.indexes.lookup(field, key)) for key in keys)
+            except TypeError:
+                # Key type not comparable with indexed keys
+                continue
+            
+            option = QueryPlan('index_lookup', field, estimated)
+            option.keys = keys
+            option.used_filters = [condition]
+            options.append(option)
+        
+        return options
+    
+    def _range_options(self, filters, row_count):
+        """Plans for range predicates, merging bounds on the same field"""
+        ranges = {}
+        
+        for condition in filters:
+            if not isinstance(condition, tuple):
+                continue
+            field, operator, value = condition
+            if operator not in self.RANGE_OPERATORS or value is None:
+                continue
+            if not self.indexes.has_index(field):
+                continue
+            
+            option = ranges.get(field)
+            if option is None:
+                option = QueryPlan('index_range', field)
+                ranges[field] = option
+            
+            try:
+                if operator in ('>', '>='):
+                    inclusive = (operator == '>=')
+                    if (option.min_key is None or value > option.min_key
+                            or (value == option.min_key and not inclusive)):
+                        option.min_key = value
+                        option.min_inclusive = inclusive
+                else:
+                    inclusive = (operator == '<=')
+                    if (option.max_key is None or value < option.max_key
+                            or (value == option.max_key and not inclusive)):
+                        option.max_key = value
+                        option.max_inclusive = inclusive
+            except TypeError:
+                # Mixed bound types - leave this field to the full scan
+                option.access = None
+                continue
+            
+            option.used_filters.append(condition)
+        
+        options = []
+        for option in ranges.values():
+            if option.access is None:
+                continue
+            try:
+                # Probe the index once so incomparable key types fall back to a scan
+                next(self.indexes.iter_index(option.index_field, option.min_key, option.max_key), None)
+            except TypeError:
+                continue
+            both_sides = option.min_key is not None and option.max_key is not None
+            selectivity = self.BETWEEN_SELECTIVITY if both_sides else self.RANGE_SELECTIVITY
+            option.estimated_rows = int(row_count * selectivity)
+            options.append(option)
+        
+        return options
+    
+    def fetch(self, plan, records):
+        """
+        Get candidate records for a plan
+        Args:
+            plan: QueryPlan from plan()
+            records: All table records
+        Returns:
+            List of candidate records (in requested order if plan.ordered)
+        """
+        if plan.access == 'full_scan':
+            return records
+        
+        return list(self.iter_candidates(plan, records))
+    
+    def iter_candidates(self, plan, records):
+        """
+        Lazily yield candidate records for a plan
+        Unordered plans yield candidates in table order, as a full scan
+        would, so results don't depend on which indexes exist. Ordered
+        index walks stop as soon as the caller stops consuming; records
+        sharing a key keep their table order.
+        
+        Args:
+            plan: QueryPlan from plan()
+            records: All table records, from table.snapshot()
+        Returns:
+            Iterator of candidate records (in requested order if plan.ordered)
+        """
+        if plan.access == 'full_scan':
+            yield from records
+            return
+        
+        positions = self.table.positions(records)
+        
+        if not plan.ordered:
+            found = {positions.get(record_id) for record_id in self._index_ids(plan)}
+            found.discard(None)
+            for position in sorted(found):
+                yield records[position]
+            return
+        
+        # Records without a value are not in the index
+        field = plan.index_field
+        walk = plan.access == 'index_order'
+        if walk and plan.nulls_first:
+            yield from (r for r in records if r.get(field) is None)
+        
+        seen = set()
+        for _, ids in self._index_entries(plan):
+            run = sorted(positions[record_id] for record_id in ids if record_id in positions)
+            if walk:
+                seen.update(run)
+            for position in run:
+                yield records[position]
+        
+        if not walk:
+            return
+        
+        # The index should hold every other record; never drop one it lacks
+        yield from (r for i, r in enumerate(records) if r.get(field) is not None and i not in seen)
+        
+        if not plan.nulls_first:
+            yield from (r for r in records if r.get(field) is None)
+    
+    def iter_keyset(self, field, after, reverse, records):
+        """
+        Walk an index in (key, id) order starting after a cursor
+        The index seeks directly to the cursor key, so no earlier
+        entries are visited. Ids sharing a key are returned ascending.
+        
+        Args:
+            field: Indexed ORDER BY field
+            after: (key, id) of the last record already returned, or None
+            reverse: Walk keys in descending order
+            records: All table records
+        Returns:
+            Iterator of records
+        """
+        positions = self.table.positions(records)
+        
+        if after is None:
+            entries = self.indexes.iter_index(field, reverse=reverse)
+            after_key = after_id = None
+        else:
+            after_key, after_id = after
+            if reverse:
+                entries = self.indexes.iter_index(field, max_key=after_key, reverse=True)
+            else:
+                entries = self.indexes.iter_index(field, min_key=after_key)
+        
+        for key, ids in entries:
+            ids = sorted(ids)
+            if after is not None and key == after_key:
+                ids = [record_id for record_id in ids if record_id > after_id]
+            for record_id in ids:
+                position = positions.get(record_id)
+                if position is not None:
+                    yield records[position]
+    
+    def _index_ids(self, plan):
+        """Yield record IDs from the index for a plan"""
+        if plan.access == 'index_union':
+            seen = set()
+            for branch in plan.branches:
+                for record_id in self._index_ids(branch):
+                    if record_id not in seen:
+                        seen.add(record_id)
+                        yield record_id
+            return
+        
+        for _, ids in self._index_entries(plan):
+            yield from ids
+    
+    def _index_entries(self, plan):
+        """Yield (key, record IDs) from a single index in plan order"""
+        field = plan.index_field
+        
+        if plan.access == 'index_lookup':
+            keys = plan.keys
+            if plan.ordered and len(keys) > 1:
+                keys = sorted(keys, reverse=plan.reverse)
+            for key in keys:
+                yield key, self.indexes.lookup(field, key)
+            return
+        
+        if plan.access == 'index_range':
+            entries = self.indexes.iter_index(field, plan.min_key, plan.max_key, plan.reverse)
+        else:
+            entries = self.indexes.iter_index(field, reverse=plan.reverse)
+        
+        for key, ids in entries:
+            # Index ranges are inclusive; drop keys equal to an exclusive bound
+            if not plan.min_inclusive and key == plan.min_key:
+                continue
+            if not plan.max_inclusive and key == plan.max_key:
+                continue
+            yield key, ids
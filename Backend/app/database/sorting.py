@@ -0,0 +1,155 @@
+"""
+Sort Keys - typed, null-safe keys for multi-column ORDER BY
+Each ORDER BY column becomes a small tuple ranking nulls, then the
+value's type, then the value, so mixed None/int/str columns sort without
+TypeError and every column can have its own direction and null placement.
+All columns are combined into one key for a single sort() / heap pass.
+"""
+
+from collections import namedtuple
+from .engine import DatabaseException
+
+
+# One ORDER BY column: direction is 'ASC' / 'DESC', nulls 'FIRST' / 'LAST'
+OrderColumn = namedtuple('OrderColumn', ['field', 'direction', 'nulls'])
+
+# Type ranks: numbers sort before strings, anything else after both
+_NUMBER, _STRING, _OTHER = 0, 1, 2
+
+
+def order_column(field, direction='ASC', nulls=None):
+    """
+    Validate and normalize one ORDER BY column
+    Nulls sort as the smallest value unless placed explicitly, so they
+    come first in ascending and last in descending order (the order an
+    index walk produces).
+    
+    Args:
+        field: Field name
+        direction: 'ASC' or 'DESC'
+        nulls: 'FIRST', 'LAST' or None for the default
+    Returns:
+        OrderColumn
+    Raises:
+        DatabaseException: If direction or nulls is invalid
+    """
+    direction = direction.upper()
+    if direction not in ('ASC', 'DESC'):
+        raise DatabaseException(f"Invalid sort direction: {direction}")
+    
+    if nulls is None:
+        nulls = 'FIRST' if direction == 'ASC' else 'LAST'
+    nulls = nulls.upper()
+    if nulls not in ('FIRST', 'LAST'):
+        raise DatabaseException(f"Invalid null placement: {nulls}")
+    
+    return OrderColumn(field, direction, nulls)
+
+
+def default_nulls(column):
+    """True if the column uses the default null placement"""
+    return column.nulls == ('FIRST' if column.direction == 'ASC' else 'LAST')
+
+
+def format_order(column):
+    """SQL-like text for an OrderColumn, e.g. 'rating DESC NULLS FIRST'"""
+    text = f"{column.field} {column.direction}"
+    if not default_nulls(column):
+        text += f" NULLS {column.nulls}"
+    return text
+
+
+class _Descending:
+    """Wraps a non-numeric value so it compares in reverse order"""
+    __slots__ = ('value',)
+    
+    def __init__(self, value):
+        self.value = value
+    
+    def __lt__(self, other):
+        return other.value < self.value
+    
+    def __gt__(self, other):
+        return other.value > self.value
+    
+    def __eq__(self, other):
+        return self.value == other.value
+    
+    def __repr__(self):
+        return f"_Descending({self.value!r})"
+
+
+def value_key(value):
+    """
+    Typed key for one non-null value: numbers, then strings, then anything
+    else by repr - the ascending ORDER BY rank, also used by MIN / MAX
+    """
+    kind = type(value)
+    if kind is int or kind is float or kind is bool:
+        return (_NUMBER, value)
+    if kind is str:
+        return (_STRING, value)
+    return (_OTHER, repr(value))
+
+
+def _column_key(field, descending, nulls_first):
+    """
+    Key function for one column, for an ascending sort
+    Returns (0,) / (2,) for nulls and (1, type rank, value) otherwise
+    """
+    null_key = (0,) if nulls_first else (2,)
+    
+    if not descending:
+        def key(record):
+            value = record.get(field)
+            if value is None:
+                return null_key
+            kind = type(value)
+            if kind is int or kind is float or kind is bool:
+                return (1, _NUMBER, value)
+            if kind is str:
+                return (1, _STRING, value)
+            return (1, _OTHER, repr(value))
+        return key
+    
+    def key(record):
+        value = record.get(field)
+        if value is None:
+            return null_key
+        kind = type(value)
+        if kind is int or kind is float or kind is bool:
+            return (1, -_NUMBER, -value)
+        if kind is str:
+            return (1, -_STRING, _Descending(value))
+        return (1, -_OTHER, _Descending(repr(value)))
+    return key
+
+
+def sort_key(columns):
+    """
+    Build one key function for a list of ORDER BY columns
+    When every column has the same direction the key is built ascending
+    and the sort runs with reverse=True, avoiding per-value wrappers for
+    descending strings; ties keep their input order either way.
+    
+    Args:
+        columns: List of OrderColumn
+    Returns:
+        (key function, reverse) for sorted() / heapq.nsmallest / nlargest
+    """
+    reverse = all(column.direction == 'DESC' for column in columns)
+    
+    keys = []
+    for column in columns:
+        nulls_first = (column.nulls == 'FIRST')
+        if reverse:
+            # The reversed sort flips null placement too
+            keys.append(_column_key(column.field, False, not nulls_first))
+        else:
+            keys.append(_column_key(column.field, column.direction == 'DESC', nulls_first))
+    
+    if len(keys) == 1:
+        return keys[0], reverse
+    
+    keys = tuple(keys)
+    return (lambda record: tuple(key(record) for key in keys)), reverse
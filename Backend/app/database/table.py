@@ -4,7 +4,10 @@ Provides ORM-like interface for database tables
 """
 
 from datetime import datetime
+from threading import Lock
 from .engine import DatabaseEngine, DatabaseException
+from .index import IndexManager
+from .validators import ValidationError, CompiledSchema, compile_schema
 
 
 class RecordNotFoundException(DatabaseException):
@@ -23,12 +26,42 @@ class Table:
         Initialize table
         Args:
             name: Table name
-            engine: DatabaseEngine instance (creates new if None)
+            engine: DatabaseEngine instance (shared default engine if None)
         """
         self.name = name
-        self.engine = engine or DatabaseEngine()
+        self.engine = engine or DatabaseEngine.shared()
         self._auto_increment_id = 0
         self._load_max_id()
+        # Table version this object last read IDs at or wrote
+        self._id_version = self.engine.table_version(self.name)
+        
+        # Field indexes kept in sync with every write (used by the query planner)
+        self.indexes = IndexManager(self.name, self.engine.index_path)
+        self.indexes.load_all_indexes()
+        self.indexes.load_version(self.engine.table_version(self.name))
+        self._index_lock = Lock()
+    
+    @classmethod
+    def shared(cls, name, engine=None):
+        """
+        Table registered on an engine, created on first use
+        Repeated calls return the same object, so the table file is parsed
+        for the auto-increment ID and indexes are loaded only once, and
+        every user shares one ID counter.
+        
+        Args:
+            name: Table name
+            engine: DatabaseEngine (default: the shared default engine)
+        Returns:
+            Table
+        """
+        engine = engine or DatabaseEngine.shared()
+        with engine.tables_lock:
+            table = engine.tables.get(name)
+            if table is None:
+                table = cls(name, engine)
+                engine.tables[name] = table
+        return table
     
     def _load_max_id(self):
         """
@@ -36,7 +69,7 @@ class Table:
         Demonstrates: iteration, conditional logic
         """
         try:
-            records = self.engine.read_table(self.name)
+            records, _ = self.engine.read_table_shared(self.name)
             if records:
                 max_id = max(r.get('id', 0) for r in records if isinstance(r.get('id'), int))
                 self._auto_increment_id = max_id
@@ -48,6 +81,98 @@ class Table:
         self._auto_increment_id += 1
         return self._auto_increment_id
     
+    def _has_indexes(self):
+        """Check if any index needs maintaining on writes"""
+        return bool(self.indexes.list_indexes() or self.indexes.list_prefix_indexes())
+    
+    def create_index(self, field_name):
+        """
+        Create BST index on a field from current records
+        Args:
+            field_name: Field to index
+        """
+        records, version = self.snapshot()
+        with self._index_lock:
+            self.indexes.create_index(field_name, records)
+            self.indexes.save_version(version)
+    
+    def sync_indexes(self, records, version):
+        """
+        Rebuild the indexes if they don't describe the given records
+        Happens when the table file was changed by something that didn't
+        maintain this object's indexes: another Table object or process,
+        restore_from_backup, import_from_csv or vacuum.
+        
+        Args:
+            records: All records of the table
+            version: Table version the records were read at
+        Returns:
+            True if the indexes were rebuilt
+        """
+        if version is not None and self.indexes.version == version:
+            return False
+        
+        with self._index_lock:
+            if version is not None and self.indexes.version == version:
+                return False
+            if not self._has_indexes():
+                self.indexes.version = version
+                return False
+            
+            self.indexes.rebuild_indexes(records)
+            self.indexes.save_version(version)
+            return True
+    
+    def _read_for_write(self):
+        """
+        Read records to modify, with the version they were read at
+        Returns:
+            (mutable records, version)
+        """
+        version = self.engine.table_version(self.name)
+        records = self.engine.read_table(self.name)
+        
+        if version is None or version != self._id_version:
+            # Written elsewhere since: generated IDs must move past theirs
+            ids = [r.get('id') for r in records if isinstance(r.get('id'), int)]
+            if ids:
+                self._auto_increment_id = max(self._auto_increment_id, max(ids))
+        return records, version
+    
+    def _update_indexes(self, version, records, removed=(), added=()):
+        """
+        Bring indexes up to date after writing records
+        The change is applied to the indexes only if they described the
+        table as it was read; otherwise they are rebuilt from the records
+        just written.
+        
+        Args:
+            version: Table version the records were read at (None forces a rebuild)
+            records: All records as written
+            removed: Records taken out (including old versions of updated records)
+            added: Records put in (including new versions of updated records)
+        """
+        with self._index_lock:
+            written = self.engine.table_version(self.name)
+            self._id_version = written
+            if not self._has_indexes():
+                self.indexes.version = written
+                return
+            
+            if version is not None and self.indexes.version == version:
+                for record in removed:
+                    self.indexes.remove_from_index(record, save=False)
+                for record in added:
+                    self.indexes.add_to_index(record, save=False)
+                self.indexes.save_indexes()
+            else:
+                self.indexes.rebuild_indexes(records)
+            self.indexes.save_version(written)
+    
+    def drop_index(self, field_name):
+        """Drop index on a field"""
+        self.indexes.drop_index(field_name)
+    
     def insert(self, data):
         """
         Insert new record - CREATE operation
@@ -61,7 +186,7 @@ class Table:
         if not isinstance(data, dict):
             raise DatabaseException("Data must be a dictionary")
         
-        records = self.engine.read_table(self.name)
+        records, version = self._read_for_write()
         
         # Create copy to avoid modifying original
         record = data.copy()
@@ -72,27 +197,39 @@ class Table:
         
         # Add timestamps
         now = datetime.now().isoformat()
-        if 'created_at' not in record:
+        if record.get('created_at') is None:
             record['created_at'] = now
         record['updated_at'] = now
         
         records.append(record)
         self.engine.write_table(self.name, records)
+        self._update_indexes(version, records, added=[record])
         
         return record
     
-    def insert_many(self, data_list):
+    def insert_many(self, data_list, schema=None):
         """
         Insert multiple records at once
         Args:
             data_list: List of dictionaries
+            schema: Validate every record first (schema dict or CompiledSchema);
+                nothing is inserted if any record fails
         Returns:
             List of inserted records
+        Raises:
+            ValidationError: With {row index: {field: message}} in `errors`
         """
         if not isinstance(data_list, list):
             raise DatabaseException("Data must be a list")
         
-        records = self.engine.read_table(self.name)
+        if schema is not None:
+            if not isinstance(schema, CompiledSchema):
+                schema = compile_schema(schema)
+            _, errors = schema.validate_many(data_list)
+            if errors:
+                raise ValidationError(f"Validation failed for {len(errors)} of {len(data_list)} records", errors)
+        
+        records, version = self._read_for_write()
         inserted = []
         
         for data in data_list:
@@ -102,7 +239,7 @@ class Table:
                 record['id'] = self._get_next_id()
             
             now = datetime.now().isoformat()
-            if 'created_at' not in record:
+            if record.get('created_at') is None:
                 record['created_at'] = now
             record['updated_at'] = now
             
@@ -110,6 +247,7 @@ class Table:
             inserted.append(record)
         
         self.engine.write_table(self.name, records)
+        self._update_indexes(version, records, added=inserted)
         
         return inserted
     
@@ -133,6 +271,30 @@ class Table:
         
         raise RecordNotFoundException(f"Record with id {record_id} not found in table '{self.name}'")
     
+    def find_by_ids(self, record_ids, records=None):
+        """
+        Find records for a list of IDs, keeping the order of the IDs
+        Missing IDs are skipped
+        
+        Args:
+            record_ids: Iterable of record IDs
+            records: Already loaded table records (optional, avoids a re-read)
+        Returns:
+            List of records
+        """
+        if records is None:
+            records = self.engine.read_table(self.name)
+        
+        by_id = {record.get('id'): record for record in records}
+        
+        result = []
+        for record_id in record_ids:
+            record = by_id.get(record_id)
+            if record is not None:
+                result.append(record)
+        
+        return result
+    
     def find_one(self, filters):
         """
         Find first record matching filters
@@ -172,6 +334,26 @@ class Table:
         
         return filtered
     
+    def snapshot(self):
+        """
+        Read all records as shared read-only views, with the table version
+        Used by queries; write paths keep reading mutable records. The
+        indexes are brought in line with the records first, so plans never
+        use an index that is stale for the records they run on.
+        Returns:
+            (records, version) - see DatabaseEngine.read_table_shared
+        """
+        records, version = self.engine.read_table_shared(self.name)
+        self.sync_indexes(records, version)
+        return records, version
+    
+    def positions(self, records):
+        """
+        {id: position} for records from snapshot()
+        Built once per table version (see DatabaseEngine.shared_positions)
+        """
+        return self.engine.shared_positions(self.name, records)
+    
     def update(self, record_id, data):
         """
         Update record - UPDATE operation
@@ -188,7 +370,7 @@ class Table:
         if not isinstance(data, dict):
             raise DatabaseException("Data must be a dictionary")
         
-        records = self.engine.read_table(self.name)
+        records, version = self._read_for_write()
         updated_record = None
         
         for i, record in enumerate(records):
@@ -202,12 +384,15 @@ class Table:
                 
                 records[i] = updated
                 updated_record = updated
+                old_record = record
                 break
         
         if updated_record is None:
             raise RecordNotFoundException(f"Record with id {record_id} not found in table '{self.name}'")
         
         self.engine.write_table(self.name, records)
+        self._update_indexes(version, records, removed=[old_record], added=[updated_record])
+        
         return updated_record
     
     def update_many(self, filters, data):
@@ -219,8 +404,9 @@ class Table:
         Returns:
             Number of records updated
         """
-        records = self.engine.read_table(self.name)
+        records, version = self._read_for_write()
         count = 0
+        changed = []
         
         for i, record in enumerate(records):
             match = True
@@ -234,10 +420,14 @@ class Table:
                 updated.update(data)
                 updated['updated_at'] = datetime.now().isoformat()
                 records[i] = updated
+                changed.append((record, updated))
                 count += 1
         
         if count > 0:
             self.engine.write_table(self.name, records)
+            self._update_indexes(version, records,
+                                 removed=[old for old, _ in changed],
+                                 added=[new for _, new in changed])
         
         return count
     
@@ -253,16 +443,19 @@ class Table:
         Raises:
             RecordNotFoundException: If record not found
         """
-        records = self.engine.read_table(self.name)
+        records, version = self._read_for_write()
         original_length = len(records)
         
         # Filter out record with matching ID
+        removed = [r for r in records if r.get('id') == record_id]
         records = [r for r in records if r.get('id') != record_id]
         
         if len(records) == original_length:
             raise RecordNotFoundException(f"Record with id {record_id} not found in table '{self.name}'")
         
         self.engine.write_table(self.name, records)
+        self._update_indexes(version, records, removed=removed)
+        
         return True
     
     def delete_many(self, filters):
@@ -273,11 +466,12 @@ class Table:
         Returns:
             Number of records deleted
         """
-        records = self.engine.read_table(self.name)
+        records, version = self._read_for_write()
         original_length = len(records)
         
         # Filter out matching records
         filtered = []
+        removed = []
         for record in records:
             match = True
             for key, value in filters.items():
@@ -286,14 +480,106 @@ class Table:
                     break
             if not match:
                 filtered.append(record)
+            else:
+                removed.append(record)
         
         count = original_length - len(filtered)
         
         if count > 0:
             self.engine.write_table(self.name, filtered)
+            self._update_indexes(version, filtered, removed=removed)
         
         return count
     
+    def write_batch(self, inserts=(), updates=None, deletes=(), upsert=False, missing_ok=False):
+        """
+        Apply inserts, updates and deletes with one read and one write
+        Used to flush a unit of work and by bulk saves; indexes are saved
+        once at the end. Unless allowed below, nothing is written if an
+        updated or deleted ID doesn't exist.
+        
+        Args:
+            inserts: List of dictionaries to insert
+            updates: {record_id: fields to update}
+            deletes: IDs of records to delete
+            upsert: Insert updates whose ID doesn't exist (keeping the ID)
+            missing_ok: Skip deletes whose ID doesn't exist
+        Returns:
+            (inserted records, updated records, number deleted); upserted
+            records are listed after the other inserted ones
+        Raises:
+            RecordNotFoundException: If an updated or deleted ID is missing
+        """
+        updates = updates or {}
+        delete_ids = set(deletes)
+        records, version = self._read_for_write()
+        
+        existing = {record.get('id') for record in records}
+        upserts = []
+        for record_id, data in updates.items():
+            if record_id not in existing:
+                if not upsert:
+                    raise RecordNotFoundException(f"Record with id {record_id} not found in table '{self.name}'")
+                upserts.append(dict(data, id=record_id))
+        if not missing_ok:
+            for record_id in delete_ids:
+                if record_id not in existing:
+                    raise RecordNotFoundException(f"Record with id {record_id} not found in table '{self.name}'")
+        
+        now = datetime.now().isoformat()
+        removed = []
+        changed = []
+        
+        if delete_ids:
+            kept = []
+            for record in records:
+                if record.get('id') in delete_ids:
+                    removed.append(record)
+                else:
+                    kept.append(record)
+            records = kept
+        
+        if updates:
+            for i, record in enumerate(records):
+                data = updates.get(record.get('id'))
+                if data is None:
+                    continue
+                updated = record.copy()
+                updated.update(data)
+                updated['id'] = record['id']
+                updated['created_at'] = record.get('created_at')
+                updated['updated_at'] = now
+                records[i] = updated
+                changed.append((record, updated))
+        
+        new_records = list(inserts) + upserts
+        
+        # Explicit IDs move the counter first so generated IDs never reuse them
+        explicit = [data.get('id') for data in new_records if isinstance(data.get('id'), int)]
+        if explicit:
+            self._auto_increment_id = max(self._auto_increment_id, max(explicit))
+        
+        inserted = []
+        for data in new_records:
+            record = data.copy()
+            if record.get('id') is None:
+                record['id'] = self._get_next_id()
+            if record.get('created_at') is None:
+                record['created_at'] = now
+            record['updated_at'] = now
+            records.append(record)
+            inserted.append(record)
+        
+        if not (inserted or changed or removed):
+            return inserted, [], 0
+        
+        self.engine.write_table(self.name, records)
+        self._update_indexes(version, records,
+                             removed=removed + [old for old, _ in changed],
+                             added=[new for _, new in changed] + inserted)
+        
+        return inserted, [updated for _, updated in changed], len(removed)
+    
     def count(self, filters=None):
         """
         Count records matching filters
@@ -326,6 +612,9 @@ class Table:
         self.engine.write_table(self.name, [])
         self._auto_increment_id = 0
         
+        # No version: rebuilding empty indexes beats removing every record
+        self._update_indexes(None, [])
+        
         return count
     
     def __repr__(self):
@@ -0,0 +1,184 @@
+"""
+Unit of Work - identity map and batched writes for models
+Inside `with UnitOfWork():` every row is loaded as at most one model
+object, and save() / delete() calls are queued and written with one
+Table.write_batch() per table when the block ends
+"""
+
+from threading import local
+
+
+class IdentityMap:
+    """
+    One model object per (model class, id)
+    Demonstrates: identity map pattern, dictionary lookups
+    """
+    
+    def __init__(self):
+        self._objects = {}  # {(model class, id): model}
+    
+    def get(self, model_class, record_id):
+        """Loaded object for an id, or None"""
+        return self._objects.get((model_class, record_id))
+    
+    def add(self, obj):
+        """Remember a model object that has an id"""
+        self._objects[(type(obj), obj.id)] = obj
+    
+    def remove(self, obj):
+        """Forget a model object"""
+        self._objects.pop((type(obj), obj.id), None)
+    
+    def load(self, model_class, data):
+        """
+        Model for a record, reusing the object already loaded for its id
+        An object already in the map is returned as is (unsaved changes
+        made to it are kept, not overwritten by the stored record).
+        
+        Args:
+            model_class: BaseModel subclass
+            data: Record dictionary
+        Returns:
+            Model object
+        """
+        key = (model_class, data.get('id'))
+        obj = self._objects.get(key)
+        if obj is None:
+            obj = model_class(**data)
+            self._objects[key] = obj
+        return obj
+    
+    def clear(self):
+        self._objects.clear()
+    
+    def __contains__(self, obj):
+        return self._objects.get((type(obj), obj.id)) is obj
+    
+    def __len__(self):
+        return len(self._objects)
+
+
+class UnitOfWork:
+    """
+    Tracks new, changed and deleted models and flushes them together
+    Usable as a context manager; units of work nest per thread and the
+    innermost one is current. Changes are committed when the block exits
+    normally and discarded if it raises.
+    Demonstrates: unit of work pattern, context managers, thread-local state
+    
+    Example:
+        with UnitOfWork():
+            user = User.find(1)
+            user.name = 'Asha'
+            user.save()                 # queued
+            User.find(1) is user        # True
+        # one write of the users table here
+    """
+    
+    _local = local()
+    
+    def __init__(self):
+        self.identity_map = IdentityMap()
+        self._new = {}      # {id(obj): obj}, in save() order
+        self._dirty = {}    # {id(obj): obj}
+        self._deleted = {}  # {id(obj): obj}
+    
+    @classmethod
+    def current(cls):
+        """Innermost active unit of work of this thread, or None"""
+        stack = getattr(cls._local, 'stack', None)
+        return stack[-1] if stack else None
+    
+    def __enter__(self):
+        if not hasattr(UnitOfWork._local, 'stack'):
+            UnitOfWork._local.stack = []
+        UnitOfWork._local.stack.append(self)
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        UnitOfWork._local.stack.remove(self)
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+    
+    def register_save(self, obj):
+        """Queue an insert (no id yet) or an update"""
+        key = id(obj)
+        if obj.id is None:
+            self._new[key] = obj
+        elif key not in self._new:
+            self._dirty[key] = obj
+            self.identity_map.add(obj)
+    
+    def register_delete(self, obj):
+        """Queue a delete (an unflushed new object is simply dropped)"""
+        key = id(obj)
+        if self._new.pop(key, None) is not None:
+            return
+        self._dirty.pop(key, None)
+        self._deleted[key] = obj
+    
+    def has_changes(self):
+        """True if anything is waiting to be flushed"""
+        return bool(self._new or self._dirty or self._deleted)
+    
+    def commit(self):
+        """
+        Write all queued changes, one write_batch() per table
+        New objects get their id and timestamps; they and updated objects
+        stay in the identity map, deleted ones are removed from it.
+        
+        Returns:
+            Number of objects written
+        """
+        batches = {}  # {table: (new objects, {id: dirty object}, deleted objects)}
+        
+        def batch(obj):
+            table = obj.get_table()
+            if table not in batches:
+                batches[table] = ([], {}, [])
+            return batches[table]
+        
+        for obj in self._new.values():
+            batch(obj)[0].append(obj)
+        for obj in self._dirty.values():
+            batch(obj)[1][obj.id] = obj
+        for obj in self._deleted.values():
+            batch(obj)[2].append(obj)
+        
+        written = 0
+        for table, (new, dirty, deleted) in batches.items():
+            inserted, updated, _ = table.write_batch(
+                inserts=[obj.to_dict() for obj in new],
+                updates={record_id: obj.to_dict() for record_id, obj in dirty.items()},
+                deletes=[obj.id for obj in deleted])
+            
+            for obj, record in zip(new, inserted):
+                obj.id = record['id']
+                obj.created_at = record['created_at']
+                obj.updated_at = record['updated_at']
+                self.identity_map.add(obj)
+            for record in updated:
+                dirty[record['id']].updated_at = record['updated_at']
+            for obj in deleted:
+                self.identity_map.remove(obj)
+            
+            written += len(new) + len(dirty) + len(deleted)
+        
+        self._new.clear()
+        self._dirty.clear()
+        self._deleted.clear()
+        return written
+    
+    def rollback(self):
+        """Discard queued changes and loaded objects"""
+        self._new.clear()
+        self._dirty.clear()
+        self._deleted.clear()
+        self.identity_map.clear()
+    
+    def __repr__(self):
+        return (f"UnitOfWork(new={len(self._new)}, dirty={len(self._dirty)}, "
+                f"deleted={len(self._deleted)}, loaded={len(self.identity_map)})")
@@ -0,0 +1,232 @@
+"""
+Vectorized Filtering - NumPy masks over numeric columns
+Numeric columns are extracted once per table version and cached as
+arrays with a null mask; WHERE clauses on them become boolean masks
+combined with & | ~ instead of one Python comparison per record
+"""
+
+from threading import Lock
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; filtering falls back to compiled predicates
+    np = None
+
+from .predicates import Condition, And, Or, Not
+
+
+# Below this many records building masks costs more than it saves
+VECTOR_THRESHOLD = 10000
+
+VECTOR_OPERATORS = ('=', '!=', '>', '<', '>=', '<=', 'IN', 'NOT IN')
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+# {(table file, field): (table version, NumericColumn or None)}
+_column_cache = {}
+_cache_lock = Lock()
+
+
+class NumericColumn:
+    """
+    One table column as a NumPy array
+    Null entries hold 0 in `values` and False in `present`
+    """
+    __slots__ = ('values', 'present')
+    
+    def __init__(self, values, present):
+        self.values = values
+        self.present = present
+    
+    def __len__(self):
+        return len(self.values)
+
+
+def numeric_array(values):
+    """
+    NumPy array for a list of values, or None if any is non-numeric
+    Ints become int64, a column with any float becomes float64;
+    bools, strings and other types are rejected. Nulls are stored as 0.
+    
+    Args:
+        values: List of field values
+    Returns:
+        numpy array or None
+    """
+    is_int = True
+    for value in values:
+        value_type = type(value)
+        if value_type is float:
+            is_int = False
+        elif value_type is not int and value is not None:
+            return None
+    
+    dtype = np.int64 if is_int else np.float64
+    try:
+        return np.fromiter((0 if value is None else value for value in values), dtype=dtype, count=len(values))
+    except OverflowError:
+        return None
+
+
+def get_column(table_key, version, records, field):
+    """
+    Cached NumericColumn for a field, rebuilt when the table version changes
+    Args:
+        table_key: Identifies the table (its file path)
+        version: Table version the records were read at
+        records: All table records, in file order
+        field: Field name
+    Returns:
+        NumericColumn, or None if the field is not purely numeric
+    """
+    key = (table_key, field)
+    with _cache_lock:
+        cached = _column_cache.get(key)
+    if cached is not None and cached[0] == version:
+        column = cached[1]
+        if column is None or len(column) == len(records):
+            return column
+    
+    values = [record.get(field) for record in records]
+    array = numeric_array(values)
+    column = None
+    if array is not None:
+        present = np.fromiter((value is not None for value in values), dtype=bool, count=len(values))
+        column = NumericColumn(array, present)
+    
+    with _cache_lock:
+        _column_cache[key] = (version, column)
+    return column
+
+
+def clear_columns(table_key=None):
+    """Drop cached columns (all tables, or one table)"""
+    with _cache_lock:
+        if table_key is None:
+            _column_cache.clear()
+            return
+        for key in [key for key in _column_cache if key[0] == table_key]:
+            del _column_cache[key]
+
+
+def _is_number(value):
+    """True for int/float values NumPy can compare exactly against int64/float64"""
+    if type(value) is int:
+        return _INT64_MIN <= value <= _INT64_MAX
+    return type(value) is float
+
+
+def _condition_mask(column, operator, value):
+    """Boolean mask for one clause, or None if it must be evaluated in Python"""
+    values, present = column.values, column.present
+    
+    if operator in ('=', '!='):
+        if value is None:
+            mask = ~present
+        elif _is_number(value):
+            mask = present & (values == value)
+        else:
+            return None
+        return ~mask if operator == '!=' else mask
+    
+    if operator in ('IN', 'NOT IN'):
+        if not isinstance(value, (list, tuple, set, frozenset)):
+            return None
+        numbers = [item for item in value if item is not None]
+        if not all(_is_number(item) for item in numbers):
+            return None
+        mask = present & np.isin(values, numbers) if numbers else np.zeros(len(values), dtype=bool)
+        if len(numbers) != len(value):
+            mask |= ~present  # None in the list matches null fields
+        return ~mask if operator == 'NOT IN' else mask
+    
+    if not _is_number(value):
+        return None
+    if operator == '>':
+        return present & (values > value)
+    if operator == '<':
+        return present & (values < value)
+    if operator == '>=':
+        return present & (values >= value)
+    if operator == '<=':
+        return present & (values <= value)
+    return None
+
+
+def _mask(item, column_for):
+    """Mask for a filter tuple or expression tree, or None if not vectorizable"""
+    if isinstance(item, Condition):
+        item = item.as_tuple()
+    
+    if isinstance(item, tuple):
+        field, operator, value = item
+        if operator not in VECTOR_OPERATORS:
+            return None
+        column = column_for(field)
+        if column is None:
+            return None
+        return _condition_mask(column, operator, value)
+    
+    if isinstance(item, Not):
+        mask = _mask(item.child, column_for)
+        return None if mask is None else ~mask
+    
+    if isinstance(item, (And, Or)):
+        masks = [_mask(child, column_for) for child in item.children]
+        if any(mask is None for mask in masks):
+            return None
+        if not masks:
+            return column_for.all_rows(isinstance(item, And))
+        combine = np.logical_and if isinstance(item, And) else np.logical_or
+        return combine.reduce(masks)
+    
+    return None
+
+
+class _ColumnLookup:
+    """Per-query column accessor bound to one table snapshot"""
+    
+    def __init__(self, table_key, version, records):
+        self.table_key = table_key
+        self.version = version
+        self.records = records
+    
+    def __call__(self, field):
+        return get_column(self.table_key, self.version, self.records, field)
+    
+    def all_rows(self, value):
+        return np.full(len(self.records), value, dtype=bool)
+
+
+def vector_filter(table_key, version, records, filters):
+    """
+    Apply the vectorizable ANDed filters with NumPy masks
+    Args:
+        table_key: Identifies the table (its file path)
+        version: Table version the records were read at (None = unknown)
+        records: All table records, in file order
+        filters: Filter tuples / expression trees (ANDed)
+    Returns:
+        (matching records, filters still to apply) or None when NumPy
+        can't help (not installed, small table, unknown version, or no
+        numeric clause)
+    """
+    if np is None or version is None or len(records) < VECTOR_THRESHOLD:
+        return None
+    
+    column_for = _ColumnLookup(table_key, version, records)
+    masks = []
+    remaining = []
+    for item in filters:
+        mask = _mask(item, column_for)
+        if mask is None:
+            remaining.append(item)
+        else:
+            masks.append(mask)
+    
+    if not masks:
+        return None
+    
+    mask = np.logical_and.reduce(masks) if len(masks) > 1 else masks[0]
+    return list(map(records.__getitem__, np.flatnonzero(mask).tolist())), remaining
@@ -39,12 +39,13 @@ def create_app():
     init_db(app)
     
     # Register blueprints
-    from app.api import auth, cities, bookings, reviews
+    from app.api import auth, cities, bookings, reviews, attractions
     
     app.register_blueprint(auth.bp, url_prefix='/api/auth')
     app.register_blueprint(cities.bp, url_prefix='/api/cities')
     app.register_blueprint(bookings.bookings_bp)
     app.register_blueprint(reviews.reviews_bp, url_prefix='/api/reviews')
+    app.register_blueprint(attractions.bp, url_prefix='/api/attractions')
     
     from app.api.upload import upload_bp
     app.register_blueprint(upload_bp, url_prefix='/api/upload')
@@ -58,6 +59,7 @@ def create_app():
             'database': 'MySQL',
             'endpoints': {
                 'cities': '/api/cities',
+                'attractions': '/api/attractions',
                 'auth': '/api/auth',
                 'bookings': '/api/bookings'
             }
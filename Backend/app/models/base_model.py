@@ -4,33 +4,174 @@ Parent class for all models
 Demonstrates: OOP inheritance, abstraction
 """
 
+import keyword
 from datetime import datetime
 from app.database.table import Table
 from app.database.query_builder import QueryBuilder
+from app.database.unit_of_work import UnitOfWork
 
 
-class BaseModel:
+# Fields every model has
+BASE_FIELDS = ('id', 'created_at', 'updated_at')
+
+
+class ModelMeta(type):
+    """
+    Builds compact model classes from a declarative field spec
+    A subclass declaring `fields` gets __slots__ for them (no per-instance
+    __dict__) and generated __init__, to_dict and from_records methods
+    that assign each field directly instead of going through **kwargs.
+    Classes without `fields` behave as before.
+    Demonstrates: metaclasses, __slots__, code generation
+    """
+    
+    def __new__(mcs, name, bases, namespace):
+        spec = namespace.get('fields')
+        if spec is None:
+            return super().__new__(mcs, name, bases, namespace)
+        
+        defaults = dict(spec) if isinstance(spec, dict) else dict.fromkeys(spec)
+        for field in defaults:
+            if not field.isidentifier() or keyword.iskeyword(field) or field.startswith('_') or field == 'self':
+                raise ValueError(f"Invalid field name for {name}: {field!r}")
+        
+        # Fields of declarative parents come first
+        inherited = {}
+        for base in reversed(bases):
+            inherited.update(getattr(base, '_field_defaults', {}))
+        inherited.update(defaults)
+        field_defaults = dict.fromkeys(BASE_FIELDS)
+        field_defaults.update(inherited)
+        
+        existing = set()
+        for base in bases:
+            for klass in base.__mro__:
+                existing.update(klass.__dict__.get('__slots__', ()))
+        namespace['__slots__'] = tuple(field for field in field_defaults if field not in existing)
+        namespace['_field_defaults'] = field_defaults
+        
+        cls = super().__new__(mcs, name, bases, namespace)
+        
+        generated = _generate_methods(tuple(field_defaults), tuple(field_defaults.values()))
+        if '__init__' not in namespace:
+            cls.__init__ = generated['__init__']
+        if 'to_dict' not in namespace:
+            cls.to_dict = generated['to_dict']
+        cls._from_records = staticmethod(generated['from_records'])
+        return cls
+
+
+def _generate_methods(fields, defaults):
+    """
+    Source-generate __init__, to_dict and from_records for a field list
+    Defaults are bound as function arguments, so they are evaluated once.
+    """
+    names = [f"d{index}" for index in range(len(fields))]
+    parameters = ', '.join(f"{field}={default}" for field, default in zip(fields, names))
+    assign = ''.join(f"        self.{field} = {field}\n" for field in fields)
+    load = ''.join(f"            obj.{field} = get({field!r}, {default})\n"
+                   for field, default in zip(fields, names))
+    items = ', '.join(f"{field!r}: self.{field}" for field in fields)
+    
+    source = (
+        f"def build({', '.join(names)}):\n"
+        f"    def __init__(self, {parameters}, **_extra):\n"
+        f"{assign}"
+        "\n"
+        "    def to_dict(self):\n"
+        f"        return {{{items}}}\n"
+        "\n"
+        "    def from_records(cls, records):\n"
+        "        new = object.__new__\n"
+        "        objects = []\n"
+        "        append = objects.append\n"
+        "        for record in records:\n"
+        "            obj = new(cls)\n"
+        "            get = record.get\n"
+        f"{load}"
+        "            append(obj)\n"
+        "        return objects\n"
+        "\n"
+        "    return {'__init__': __init__, 'to_dict': to_dict, 'from_records': from_records}\n"
+    )
+    namespace = {}
+    exec(compile(source, '<model fields>', 'exec'), namespace)
+    return namespace['build'](*defaults)
+
+
+class BaseModel(metaclass=ModelMeta):
     """
     Base model class providing common functionality
     All models inherit from this class
+    
+    Subclasses may declare their fields instead of writing __init__ and
+    to_dict; instances then use __slots__ and take a fraction of the memory:
+    
+        class Review(BaseModel):
+            table_name = 'reviews'
+            fields = {'city_id': None, 'rating': 0, 'comment': ''}
+    
+    Defaults are shared by all instances, so they should be immutable.
     """
     
+    # Subclasses without `fields` don't declare __slots__ and get a __dict__
+    __slots__ = BASE_FIELDS
+    
     table_name = None  # Override in subclasses
     
     def __init__(self, **kwargs):
         self.id = kwargs.get('id')
         self.created_at = kwargs.get('created_at')
         self.updated_at = kwargs.get('updated_at')
-        self._table = Table(self.table_name) if self.table_name else None
+    
+    @property
+    def _table(self):
+        """Shared Table of this model (None without table_name)"""
+        return self.get_table() if self.table_name else None
+    
+    @classmethod
+    def from_records(cls, records):
+        """
+        Build models for many records at once
+        Declarative models assign their slots directly; other models are
+        constructed with cls(**record).
+        
+        Args:
+            records: Iterable of record dictionaries
+        Returns:
+            List of models
+        """
+        if '_from_records' in cls.__dict__:
+            return cls._from_records(cls, records)
+        return [cls(**record) for record in records]
+    
+    @classmethod
+    def get_table(cls):
+        """Shared Table for this model (one per table name and engine)"""
+        return Table.shared(cls.table_name)
+    
+    @classmethod
+    def _load(cls, data):
+        """Model for a record (the same object per id inside a UnitOfWork)"""
+        unit = UnitOfWork.current()
+        if unit is None:
+            return cls(**data)
+        return unit.identity_map.load(cls, data)
     
     def save(self):
         """
         Save model to database
+        Inside a UnitOfWork the write is queued until the unit commits
         Demonstrates: polymorphism
         """
         if not self._table:
             raise NotImplementedError("table_name must be set in subclass")
         
+        unit = UnitOfWork.current()
+        if unit is not None:
+            unit.register_save(self)
+            return self
+        
         data = self.to_dict()
         
         if self.id:
@@ -47,44 +188,118 @@ class BaseModel:
     
     def delete(self):
         """Delete model from database"""
+        unit = UnitOfWork.current()
+        if unit is not None:
+            unit.register_delete(self)
+            return True
+        
         if not self.id:
             raise ValueError("Cannot delete unsaved model")
         return self._table.delete(self.id)
     
+    @classmethod
+    def bulk_save(cls, objects):
+        """
+        Insert or update many models with a single table write
+        Models without an id are inserted and get ids from the table's
+        counter; models with an id update their record (or insert it with
+        that id if it doesn't exist yet). Indexes are updated once.
+        The write happens immediately, even inside a UnitOfWork.
+        
+        Args:
+            objects: Iterable of models of this class
+        Returns:
+            List of the saved models (ids and timestamps filled in)
+        
+        Example:
+            City.bulk_save(City(name=row['name']) for row in rows)
+        """
+        if not cls.table_name:
+            raise NotImplementedError("table_name must be set in subclass")
+        
+        objects = list(objects)
+        new = []
+        inserts = []
+        updates = {}
+        by_id = {}
+        for obj in objects:
+            if obj.id is None:
+                new.append(obj)
+                inserts.append(obj.to_dict())
+            else:
+                updates[obj.id] = obj.to_dict()
+                by_id[obj.id] = obj
+        
+        inserted, updated, _ = cls.get_table().write_batch(inserts, updates, upsert=True)
+        
+        for obj, record in zip(new, inserted):
+            obj.id = record['id']
+            obj.created_at = record['created_at']
+            obj.updated_at = record['updated_at']
+        for record in inserted[len(new):] + updated:
+            obj = by_id[record['id']]
+            obj.created_at = record.get('created_at')
+            obj.updated_at = record['updated_at']
+        
+        return objects
+    
+    @classmethod
+    def bulk_delete(cls, ids):
+        """
+        Delete many records with a single table write
+        IDs that don't exist are ignored.
+        
+        Args:
+            ids: Iterable of record ids
+        Returns:
+            Number of records deleted
+        """
+        if not cls.table_name:
+            raise NotImplementedError("table_name must be set in subclass")
+        
+        _, _, deleted = cls.get_table().write_batch(deletes=ids, missing_ok=True)
+        return deleted
+    
     @classmethod
     def find(cls, record_id):
         """
         Find record by ID
+        Inside a UnitOfWork an already loaded object is returned without
+        reading the table
         Demonstrates: class methods
         """
-        table = Table(cls.table_name)
-        data = table.find_by_id(record_id)
-        return cls(**data)
+        unit = UnitOfWork.current()
+        if unit is not None:
+            obj = unit.identity_map.get(cls, record_id)
+            if obj is not None:
+                return obj
+        
+        data = cls.get_table().find_by_id(record_id)
+        return cls._load(data)
     
     @classmethod
     def find_one(cls, filters):
         """Find first record matching filters"""
-        table = Table(cls.table_name)
-        data = table.find_one(filters)
-        return cls(**data) if data else None
+        data = cls.get_table().find_one(filters)
+        return cls._load(data) if data else None
     
     @classmethod
     def all(cls, filters=None):
         """Get all records"""
-        table = Table(cls.table_name)
-        records = table.find_all(filters)
-        return [cls(**r) for r in records]
+        records = cls.get_table().find_all(filters)
+        if UnitOfWork.current() is None:
+            return cls.from_records(records)
+        return [cls._load(r) for r in records]
     
     @classmethod
     def query(cls):
         """Get query builder for this model"""
-        return QueryBuilder(Table(cls.table_name))
+        return QueryBuilder(cls.get_table())
     
     @classmethod
     def count(cls, filters=None):
         """Count records"""
-        table = Table(cls.table_name)
-        return table.count(filters)
+        return cls.get_table().count(filters)
     
     def to_dict(self):
         """
@@ -0,0 +1,105 @@
+"""
+Autocomplete Service
+Name suggestions served from Trie prefix indexes
+"""
+
+from threading import Lock
+from time import monotonic
+from sqlalchemy import func
+from app.data_structures.trie import Trie
+
+
+class AutocompleteService:
+    """
+    Keeps one prefix index per model and answers prefix queries from it
+    The index is rebuilt only when the table changes (row count, max id or
+    last update time), so typing does not hit the database with ILIKE scans.
+    Indexes are plain in-memory Tries: they are derived from Postgres rows
+    and never written next to the custom database's index files.
+    The fingerprint is checked at most every VERSION_TTL seconds, and only
+    one request thread rebuilds a stale index.
+    """
+    
+    # Seconds a checked index is served without re-reading the fingerprint
+    VERSION_TTL = 2.0
+    
+    _indexes = {}  # {(table_name, field_name): (version, Trie of key -> [ids], checked at)}
+    _rebuild_lock = Lock()
+    
+    @staticmethod
+    def _table_version(model):
+        """Cheap fingerprint of a table used to detect changes"""
+        from app.database.config import db
+        
+        columns = [func.count(model.id), func.max(model.id)]
+        if hasattr(model, 'updated_at'):
+            columns.append(func.max(model.updated_at))
+        
+        return tuple(db.session.query(*columns).one())
+    
+    @staticmethod
+    def _get_index(model, field_name):
+        """Get (or rebuild) the prefix index for model.field_name"""
+        key = (model.__tablename__, field_name)
+        cached = AutocompleteService._indexes.get(key)
+        if cached and monotonic() - cached[2] < AutocompleteService.VERSION_TTL:
+            return cached[1]
+        
+        version = AutocompleteService._table_version(model)
+        if cached and cached[0] == version:
+            AutocompleteService._indexes[key] = (version, cached[1], monotonic())
+            return cached[1]
+        
+        with AutocompleteService._rebuild_lock:
+            # Another thread may have rebuilt it while this one waited
+            cached = AutocompleteService._indexes.get(key)
+            if cached and cached[0] == version:
+                return cached[1]
+            
+            trie = AutocompleteService._build_index(model, field_name)
+            AutocompleteService._indexes[key] = (version, trie, monotonic())
+            return trie
+    
+    @staticmethod
+    def _build_index(model, field_name):
+        """Trie of field value -> [ids] over every row of the model"""
+        from app.database.config import db
+        
+        column = getattr(model, field_name)
+        rows = db.session.query(model.id, column).filter(column.isnot(None)).all()
+        
+        trie = Trie()
+        for record_id, key in rows:
+            record_ids = trie.search(key)
+            if record_ids is None:
+                trie.insert(key, [record_id])
+            else:
+                record_ids.append(record_id)
+        
+        return trie
+    
+    @staticmethod
+    def suggest(model, prefix, limit=10, field_name='name'):
+        """
+        Get name suggestions starting with prefix
+        Args:
+            model: SQLAlchemy model class (City, Attraction)
+            prefix: Text typed so far
+            limit: Maximum number of suggestions
+            field_name: Field with the prefix index
+        Returns:
+            List of {'id', field_name} dictionaries
+        """
+        if limit < 1:
+            return []
+        
+        trie = AutocompleteService._get_index(model, field_name)
+        
+        suggestions = []
+        for key, record_ids in trie.starts_with(prefix, limit):
+            for record_id in record_ids:
+                suggestions.append({'id': record_id, field_name: key})
+                if len(suggestions) >= limit:
+                    return suggestions
+        
+        return suggestions
@@ -0,0 +1,112 @@
+"""
+Hash Table Benchmark
+Compares the open-addressing HashTable with the original chained
+implementation and the built-in dict for inserts, hits, misses and
+deletes, with short integer keys and long string keys. Times are
+microseconds per operation; the chained table hashes strings in O(n^2)
+and only gets a sample of the long string keys. A last section times a
+bulk load with and without reserve().
+
+Run from the Backend directory:
+    python benchmarks/bench_hash_table.py [key_count]
+"""
+import random
+import sys
+import time
+sys.path.insert(0, '.')
+
+from app.data_structures.hash_table import HashTable, ChainedHashTable
+
+
+class DictTable(dict):
+    """dict with the HashTable method names"""
+    put = dict.__setitem__
+    
+    def delete(self, key):
+        return self.pop(key, None) is not None
+
+
+# (name, factory, max keys for long strings)
+IMPLEMENTATIONS = [
+    ('dict', DictTable, None),
+    ('HashTable', HashTable, None),
+    ('chained', ChainedHashTable, 2_000),
+]
+
+
+def make_keys(count):
+    """(int keys, long string keys, keys that are never inserted)"""
+    rng = random.Random(42)
+    ints = rng.sample(range(count * 10), count)
+    strings = [f"/api/cities?tag=heritage&page={i}&" + 'x' * 200 for i in range(count)]
+    missing = [-key - 1 for key in ints]
+    return ints, strings, missing
+
+
+def run(factory, keys, missing):
+    """{operation: microseconds per operation} for one implementation"""
+    timings = {}
+    
+    start = time.perf_counter()
+    table = factory()
+    for key in keys:
+        table.put(key, key)
+    timings['insert'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for key in keys:
+        table.get(key)
+    timings['hit'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for key in missing:
+        table.get(key)
+    timings['miss'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for key in keys[::2]:
+        table.delete(key)
+    timings['delete'] = time.perf_counter() - start
+    
+    assert len(table) == len(keys) - len(keys[::2])
+    timings['delete'] *= 2
+    return {operation: seconds * 1e6 / len(keys) for operation, seconds in timings.items()}
+
+
+def bulk_load(keys):
+    """(seconds growing from the default size, seconds after reserve())"""
+    start = time.perf_counter()
+    table = HashTable()
+    for key in keys:
+        table.put(key, key)
+    grown = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    table = HashTable()
+    table.reserve(len(keys))
+    for key in keys:
+        table.put(key, key)
+    return grown, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"Generating {count:,} keys...")
+    ints, strings, missing = make_keys(count)
+    
+    for label, keys, misses in [('int keys', ints, missing),
+                                ('long str keys', strings, [key + '!' for key in strings])]:
+        print(f"\n{label}")
+        print(f"{'table':>10} {'keys':>9} {'insert us':>10} {'hit us':>8} {'miss us':>8} {'delete us':>10}")
+        for name, factory, string_limit in IMPLEMENTATIONS:
+            limit = string_limit if keys is strings and string_limit else len(keys)
+            timings = run(factory, keys[:limit], misses[:limit])
+            print(f"{name:>10} {limit:>9,} {timings['insert']:>10.2f} {timings['hit']:>8.2f} "
+                  f"{timings['miss']:>8.2f} {timings['delete']:>10.2f}")
+    
+    grown, reserved = bulk_load(ints)
+    print(f"\nbulk load of {count:,} int keys: {grown:.3f}s growing, {reserved:.3f}s with reserve()")
+
+
+if __name__ == '__main__':
+    main()
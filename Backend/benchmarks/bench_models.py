@@ -0,0 +1,80 @@
+"""
+Model Memory Benchmark
+Compares the memory held by plain dict records, classic BaseModel
+subclasses (per-instance __dict__) and declarative __slots__ models
+built with from_records()
+
+Run from the Backend directory:
+    python benchmarks/bench_models.py [record_count]
+"""
+import sys
+import time
+import tracemalloc
+sys.path.insert(0, '.')
+
+from app.models.base_model import BaseModel
+
+
+class ClassicReview(BaseModel):
+    table_name = 'reviews'
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.user_id = kwargs.get('user_id')
+        self.city_id = kwargs.get('city_id')
+        self.rating = kwargs.get('rating')
+        self.comment = kwargs.get('comment')
+
+
+class SlottedReview(BaseModel):
+    table_name = 'reviews'
+    fields = ('user_id', 'city_id', 'rating', 'comment')
+
+
+def make_records(count):
+    """Generate synthetic review records"""
+    return [
+        {
+            'id': i,
+            'user_id': i % 5000,
+            'city_id': i % 120,
+            'rating': i % 5 + 1,
+            'comment': 'Great trip',
+            'created_at': '2024-01-01T10:00:00',
+            'updated_at': '2024-01-01T10:00:00',
+        }
+        for i in range(count)
+    ]
+
+
+def measure(build):
+    """(seconds, bytes allocated) to build and hold the result"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return elapsed, size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Generating {count:,} records...")
+    records = make_records(count)
+    
+    cases = [
+        ('dict records', lambda: [dict(record) for record in records]),
+        ('classic models', lambda: [ClassicReview(**record) for record in records]),
+        ('slotted models', lambda: SlottedReview.from_records(records)),
+    ]
+    
+    print(f"{'representation':>16} {'MB':>8} {'bytes/row':>10} {'build (s)':>10}")
+    for name, build in cases:
+        elapsed, size = measure(build)
+        print(f"{name:>16} {size / 1e6:>8.1f} {size / count:>10.0f} {elapsed:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
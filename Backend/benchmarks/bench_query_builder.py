@@ -0,0 +1,120 @@
+"""
+QueryBuilder Filter Benchmark
+Compares the old one-pass-per-filter evaluation with the compiled,
+fused predicate used by QueryBuilder, for 1-10 predicates
+
+Run from the Backend directory:
+    python benchmarks/bench_query_builder.py [record_count]
+"""
+import random
+import sys
+import time
+sys.path.insert(0, '.')
+
+from app.database.predicates import compile_filters
+
+
+REGIONS = ['North', 'South', 'East', 'West', 'Central']
+CATEGORIES = ['Historical', 'Nature', 'Beach', 'Spiritual', 'Modern']
+
+# Mostly-true predicates so every record runs through all of them
+PREDICATES = [
+    ('budget', '>=', 100),
+    ('rating', '<=', 5.0),
+    ('region', 'IN', REGIONS),
+    ('category', '!=', 'Unknown'),
+    ('name', 'LIKE', 'city'),
+    ('days', '>', 0),
+    ('budget', '<', 100000),
+    ('rating', '>=', 0.5),
+    ('category', 'NOT IN', ['Closed']),
+    ('is_active', '=', True),
+]
+
+
+def make_records(count):
+    """Generate synthetic city-like records"""
+    rng = random.Random(42)
+    return [
+        {
+            'id': i,
+            'name': f'City {i}',
+            'region': rng.choice(REGIONS),
+            'category': rng.choice(CATEGORIES),
+            'budget': rng.randint(500, 10000),
+            'rating': round(rng.uniform(1, 5), 1),
+            'days': rng.randint(1, 7),
+            'is_active': True,
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_filter(records, field, operator, value):
+    """Previous QueryBuilder._apply_filter: operator dispatch per record"""
+    filtered = []
+    for record in records:
+        field_value = record.get(field)
+        if operator == '=':
+            if field_value == value:
+                filtered.append(record)
+        elif operator == '!=':
+            if field_value != value:
+                filtered.append(record)
+        elif operator == '>':
+            if field_value is not None and field_value > value:
+                filtered.append(record)
+        elif operator == '<':
+            if field_value is not None and field_value < value:
+                filtered.append(record)
+        elif operator == '>=':
+            if field_value is not None and field_value >= value:
+                filtered.append(record)
+        elif operator == '<=':
+            if field_value is not None and field_value <= value:
+                filtered.append(record)
+        elif operator == 'LIKE':
+            if field_value and value.lower() in str(field_value).lower():
+                filtered.append(record)
+        elif operator == 'IN':
+            if field_value in value:
+                filtered.append(record)
+        elif operator == 'NOT IN':
+            if field_value not in value:
+                filtered.append(record)
+    return filtered
+
+
+def run_legacy(records, filters):
+    for field, operator, value in filters:
+        records = legacy_filter(records, field, operator, value)
+    return records
+
+
+def run_compiled(records, filters):
+    predicate = compile_filters(filters)
+    return predicate.filter_many(records)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Generating {count:,} records...")
+    records = make_records(count)
+    
+    print(f"{'predicates':>10} {'legacy (s)':>12} {'compiled (s)':>13} {'speedup':>8}")
+    for n in range(1, len(PREDICATES) + 1):
+        filters = PREDICATES[:n]
+        legacy_time, legacy_rows = timed(run_legacy, records, filters)
+        compiled_time, compiled_rows = timed(run_compiled, records, filters)
+        assert len(legacy_rows) == len(compiled_rows)
+        print(f"{n:>10} {legacy_time:>12.3f} {compiled_time:>13.3f} {legacy_time / compiled_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
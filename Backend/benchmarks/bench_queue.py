@@ -0,0 +1,98 @@
+"""
+Queue Benchmark
+Compares the ring-buffer Queue with the previous list.pop(0) queue and
+collections.deque for bulk FIFO workloads, and times Graph.bfs over a
+large random graph
+
+Run from the Backend directory:
+    python benchmarks/bench_queue.py [item_count]
+"""
+import random
+import sys
+import time
+from collections import deque
+sys.path.insert(0, '.')
+
+from app.data_structures.queue import Queue
+from app.data_structures.graph import Graph
+
+
+class ListQueue:
+    """The previous Queue: dequeue shifts the whole list - O(n)"""
+    
+    def __init__(self):
+        self._items = []
+    
+    def enqueue(self, item):
+        self._items.append(item)
+    
+    def dequeue(self):
+        return self._items.pop(0)
+
+
+class DequeQueue(deque):
+    """deque with the Queue method names"""
+    enqueue = deque.append
+    dequeue = deque.popleft
+
+
+# (name, factory, max items - list.pop(0) is quadratic)
+IMPLEMENTATIONS = [
+    ('deque', DequeQueue, None),
+    ('Queue', Queue, None),
+    ('list.pop(0)', ListQueue, 200_000),
+]
+
+
+def fill_then_drain(factory, count):
+    """Enqueue count items, then dequeue them all"""
+    queue = factory()
+    for i in range(count):
+        queue.enqueue(i)
+    for _ in range(count):
+        queue.dequeue()
+
+
+def steady_state(factory, count):
+    """Keep about 1,000 items queued while count items pass through"""
+    queue = factory()
+    for i in range(1_000):
+        queue.enqueue(i)
+    for i in range(count):
+        queue.enqueue(i)
+        queue.dequeue()
+
+
+def make_graph(vertex_count, edges_per_vertex=4):
+    """Random undirected graph"""
+    rng = random.Random(42)
+    graph = Graph()
+    for vertex in range(vertex_count):
+        for _ in range(edges_per_vertex // 2):
+            graph.add_edge(vertex, rng.randrange(vertex_count))
+    return graph
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    
+    print(f"{'queue':>12} {'items':>10} {'fill+drain (s)':>15} {'steady (s)':>11}")
+    for name, factory, limit in IMPLEMENTATIONS:
+        items = min(count, limit) if limit else count
+        print(f"{name:>12} {items:>10,} {timed(fill_then_drain, factory, items):>15.3f} "
+              f"{timed(steady_state, factory, items):>11.3f}")
+    
+    print(f"\nBuilding graph with {count:,} vertices...")
+    graph = make_graph(count)
+    elapsed = timed(graph.bfs, 0)
+    print(f"Graph.bfs over {count:,} vertices: {elapsed:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
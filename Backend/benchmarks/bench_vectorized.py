@@ -0,0 +1,68 @@
+"""
+Vectorized Filter Benchmark
+Compares the compiled Python predicate with NumPy masks over cached
+numeric columns for range filters on budget / rating
+
+Run from the Backend directory:
+    python benchmarks/bench_vectorized.py [record_count]
+"""
+import random
+import sys
+import time
+sys.path.insert(0, '.')
+
+from app.database.predicates import compile_filters, or_
+from app.database.vectorized import vector_filter
+
+
+QUERIES = [
+    ('budget > 5000', [('budget', '>', 5000)]),
+    ('budget BETWEEN', [('budget', '>=', 2000), ('budget', '<=', 4000)]),
+    ('rating >= 4.5', [('rating', '>=', 4.5)]),
+    ('budget + rating', [('budget', '<', 3000), ('rating', '>', 4.0)]),
+    ('days IN', [('days', 'IN', [2, 3, 5])]),
+    ('OR of ranges', [or_(('budget', '<', 1000), ('rating', '>', 4.8))]),
+]
+
+
+def make_records(count):
+    """Generate synthetic city-like records"""
+    rng = random.Random(42)
+    return [
+        {
+            'id': i,
+            'name': f'City {i}',
+            'budget': rng.randint(500, 10000),
+            'rating': round(rng.uniform(1, 5), 1),
+            'days': rng.randint(1, 7) if i % 10 else None,
+        }
+        for i in range(count)
+    ]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Generating {count:,} records...")
+    records = make_records(count)
+    version = ('benchmark',)
+    
+    print(f"{'query':>16} {'python (s)':>11} {'numpy (s)':>10} {'speedup':>8}")
+    for name, filters in QUERIES:
+        # First call builds and caches the columns
+        build_time, _ = timed(vector_filter, 'bench', version, records, filters)
+        
+        python_time, python_rows = timed(compile_filters(filters).filter_many, records)
+        numpy_time, (numpy_rows, remaining) = timed(vector_filter, 'bench', version, records, filters)
+        assert not remaining and len(python_rows) == len(numpy_rows)
+        print(f"{name:>16} {python_time:>11.3f} {numpy_time:>10.3f} {python_time / numpy_time:>7.1f}x"
+              f"   (first call {build_time:.3f}s)")
+
+
+if __name__ == '__main__':
+    main()